@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of Pagination construction, window computation and rendering.
+
+Run from the repository root::
+
+    $ python benchmarks/bench_pagination.py --json before.json
+    $ python benchmarks/bench_pagination.py --json after.json --compare before.json
+
+Every case reports ops/sec and the bytes allocated by one call (peak
+traced by tracemalloc).
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+from flask_paginate import CURRENT_PAGES, Pagination  # noqa: E402
+
+TOTALS = dict(small=100, huge=10**12)
+WINDOWS = dict(narrow=(2, 1), wide=(50, 10))
+OPERATIONS = ("init", "pages", "links", "info")
+
+
+def create_app():
+    app = Flask(__name__)
+
+    def items(page=1):
+        return ""
+
+    app.add_url_rule("/items", "items", items)
+    app.add_url_rule("/users", "users", items, defaults={"page": 1})
+    app.add_url_rule("/users/page/<int:page>", "users", items)
+    return app
+
+
+def request_url(route, page):
+    if route == "view_args":
+        return "/users/page/{0}?q=name&sort=asc".format(page)
+
+    return "/items?q=name&sort=asc&page={0}".format(page)
+
+
+def make_call(operation, kwargs):
+    if operation == "init":
+        return lambda: Pagination(**kwargs)
+
+    pagination = Pagination(**kwargs)
+    return lambda: getattr(pagination, operation)
+
+
+def measure(func, min_time):
+    func()  # warm up the caches
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+
+        number *= 2
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return number / elapsed, peak - base
+
+
+def cases(frameworks, routes):
+    for framework in frameworks:
+        for total_name, total in sorted(TOTALS.items()):
+            for window_name, (inner, outer) in sorted(WINDOWS.items()):
+                for route in routes:
+                    for operation in OPERATIONS:
+                        name = "/".join(
+                            (framework, total_name, window_name, route, operation)
+                        )
+                        kwargs = dict(
+                            total=total,
+                            per_page=10,
+                            page=max(total // 10 // 2, 1),
+                            css_framework=framework,
+                            inner_window=inner,
+                            outer_window=outer,
+                        )
+                        yield name, route, operation, kwargs
+
+
+def git_revision():
+    try:
+        out = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return out.decode("ascii").strip()
+
+
+def run(args):
+    app = create_app()
+    frameworks = sorted(CURRENT_PAGES)
+    if args.framework:
+        frameworks = [f for f in frameworks if f in args.framework]
+
+    results = {}
+    for name, route, operation, kwargs in cases(frameworks, args.route):
+        if args.filter and args.filter not in name:
+            continue
+
+        with app.test_request_context(request_url(route, kwargs["page"])):
+            app.preprocess_request()
+            ops, alloc = measure(make_call(operation, kwargs), args.min_time)
+
+        results[name] = dict(ops_per_sec=ops, alloc_bytes=alloc)
+        print("{0:<48} {1:>12,.0f} ops/s {2:>9,} B".format(name, ops, alloc))
+
+    return dict(
+        revision=git_revision(),
+        python=platform.python_version(),
+        results=results,
+    )
+
+
+def compare(report, baseline):
+    print()
+    print("{0:<48} {1:>10} {2:>10}".format("case", "ops/s", "alloc"))
+    for name, new in sorted(report["results"].items()):
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+
+        speed = new["ops_per_sec"] / old["ops_per_sec"] - 1
+        alloc = new["alloc_bytes"] - old["alloc_bytes"]
+        print("{0:<48} {1:>+9.1%} {2:>+9,} B".format(name, speed, alloc))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="compare with a previous json file")
+    parser.add_argument("--filter", help="only run the cases containing it")
+    parser.add_argument(
+        "--framework", action="append", help="only run this css framework"
+    )
+    parser.add_argument(
+        "--route",
+        action="append",
+        choices=("query", "view_args"),
+        help="only run this route kind",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="minimum seconds to time each case, default is 0.05",
+    )
+    args = parser.parse_args()
+    if not args.route:
+        args.route = ["query", "view_args"]
+
+    report = run(args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,15 +13,126 @@ Adds pagination support to your flask application.
 
 from __future__ import unicode_literals
 
+import functools
+import hashlib
+import json
+import operator
 import sys
-
-from flask import current_app, request, url_for
+import time
+import types
+from contextvars import ContextVar
+from itertools import islice
+
+try:
+    from collections.abc import Sequence
+except ImportError:  # pragma: no cover
+    from collections import Sequence
+
+try:
+    from urllib.parse import quote as url_quote
+except ImportError:  # pragma: no cover
+    from urllib import quote as url_quote
+
+import flask
+from itsdangerous import BadSignature, URLSafeSerializer
 from markupsafe import Markup
+from werkzeug.datastructures import ImmutableMultiDict
+from werkzeug.exceptions import abort
+from werkzeug.local import LocalProxy
+
+try:
+    from blinker import Namespace
+except ImportError:  # blinker is only required by flask>=2.3
+
+    class _FakeSignal(object):
+        receivers = {}
+
+        def send(self, *args, **kwargs):
+            return []
+
+        def connect(self, *args, **kwargs):
+            raise RuntimeError("signals require blinker")
+
+    class Namespace(object):
+        def signal(self, name, doc=None):
+            return _FakeSignal()
+
+
+from .cache import (  # noqa: F401
+    BoundaryIndex,
+    FragmentCache,
+    LRUCountCache,
+    SharedMemoryCountCache,
+    cached_total,
+)
 
 __version__ = "2024.04.12"
 
 PY2 = sys.version_info[0] == 2
 
+# the sender is the app, the kwargs are pagination, css_framework, page,
+# per_page, total_pages, urls_built and elapsed_ns
+# (page, per_page and offset for page_args_parsed)
+_signals = Namespace()
+page_args_parsed = _signals.signal("pagination-page-args-parsed")
+pagination_created = _signals.signal("pagination-created")
+links_rendered = _signals.signal("pagination-links-rendered")
+info_rendered = _signals.signal("pagination-info-rendered")
+
+
+# the quart module once an async entry point (see flask_paginate.aio) saw
+# a quart request, only set in the context of that request
+_quart_context = ContextVar("flask_paginate_quart", default=None)
+
+
+def _quart():
+    """Get the quart module when it serves the current request."""
+    quart = sys.modules.get("quart")
+    if quart is None or flask.has_app_context() or not quart.has_app_context():
+        return None
+
+    return quart
+
+
+def use_quart():
+    """Use the quart globals for the rest of the current request when quart
+    serves it, :func:`flask_paginate.aio.paginate_async` calls it."""
+    quart = _quart()
+    if quart is not None:
+        _quart_context.set(quart)
+
+    return quart
+
+
+def _get_request():
+    quart = _quart_context.get()
+    if quart is not None:
+        return quart.request._get_current_object()
+
+    return flask.request._get_current_object()
+
+
+def _get_app():
+    quart = _quart_context.get()
+    if quart is not None:
+        return quart.current_app._get_current_object()
+
+    return flask.current_app._get_current_object()
+
+
+# flask globals, or quart ones after use_quart()
+request = LocalProxy(_get_request)
+current_app = LocalProxy(_get_app)
+
+
+def url_for(endpoint, **values):
+    quart = _quart_context.get()
+    if quart is not None:
+        return quart.url_for(endpoint, **values)
+
+    return flask.url_for(endpoint, **values)
+
+
 # previous link
 _bs = '<li class="previous"><a href="{0}"{2}>{1}</a></li>'
 _bs33 = '<li><a href="{0}" aria-label="Previous"{2}>\
@@ -194,6 +305,8 @@ total <b>{total}</b>"
 SEARCH_MSG = "found <b>{found}</b> {record_name}, \
 displaying <b>{start} - {end}</b>"
 
+UNKNOWN_TOTAL_MSG = "displaying <b>{start} - {end}</b> {record_name}"
+
 _bs4 = '<nav aria-label="..."><ul class="pagination {0} {1}">'
 _bs5 = '<nav aria-label="..."><ul class="pagination {0} {1}">'
 _bs33 = '<nav aria-label="..."><ul class="pagination {0} {1}">'
@@ -224,20 +337,423 @@ CSS_LINKS_END = dict(
     materialize="</ul>",
 )
 
+# normal link per css framework
+LINKS = dict(
+    bootstrap=LINK,
+    bootstrap2=LINK,
+    bootstrap3=LINK,
+    bootstrap3_3=LINK,
+    bootstrap4=BS4_LINK,
+    bootstrap5=BS5_LINK,
+    semantic=SEMANTIC_LINK,
+    foundation=LINK,
+    bulma=BULMA_LINK,
+    materialize=MATERIALIZE_LINK,
+)
+
+# raw templates per css framework, by register_css_framework names
+TEMPLATES = dict(
+    current_page=CURRENT_PAGES,
+    gap_marker=GAP_MARKERS,
+    prev_page=PREV_PAGES,
+    next_page=NEXT_PAGES,
+    prev_disabled_page=PREV_DISABLED_PAGES,
+    next_disabled_page=NEXT_DISABLED_PAGES,
+    css_links=CSS_LINKS,
+    css_links_end=CSS_LINKS_END,
+)
+
+# <link> tag hinting the browser to fetch a page, {0} rel and {1} url
+RESOURCE_HINT = '<link rel="{0}" href="{1}">'
+
+# resource hint per css framework, the others use RESOURCE_HINT
+RESOURCE_HINTS = {}
+
+# page number used to build the url template, must survive url converters
+PAGE_SENTINEL = "9876543210123456789"
+
+# salt of the signed cursors
+CURSOR_SALT = "flask-paginate-cursor"
+
 # foundation alignment
 F_ALIGNMENT = '<div class="pagination-{0}">'
 
+# pagination attributes of the raw templates
+TEMPLATE_ATTRS = (
+    ("link", "link"),
+    ("current_page_fmt", "current_page"),
+    ("link_css_fmt", "css_links"),
+    ("gap_marker_fmt", "gap_marker"),
+    ("prev_disabled_page_fmt", "prev_disabled_page"),
+    ("next_disabled_page_fmt", "next_disabled_page"),
+    ("prev_page_fmt", "prev_page"),
+    ("next_page_fmt", "next_page"),
+    ("css_end_fmt", "css_links_end"),
+)
+
+# template overrides per pagination class
+_template_overrides = {}
+
+# cached renderers, keyed by the settings applied to the templates
+_renderers = {}
+MAX_RENDERERS = 256
+
+
+def _escape_fmt(value):
+    """Escape a value which will be baked into a format string."""
+    return "{0}".format(value).replace("{", "{{").replace("}", "}}")
+
+
+def _resolve_css_framework(css_framework, bs_version=4):
+    """Get the (css_framework, bs_version) pair from the settings."""
+    css_framework = (css_framework or "bootstrap4").lower()
+    if css_framework not in CURRENT_PAGES:
+        css_framework = "bootstrap4"
+
+    if not css_framework.startswith("bootstrap"):
+        return css_framework, None
+
+    version = css_framework[9:]
+    if version in ("3_3", "3.3"):
+        bs_version = "3.3"
+    elif version:
+        bs_version = version
+    elif bs_version in (2, "2"):
+        css_framework = "bootstrap"
+    elif bs_version in (3, "3"):
+        css_framework = "bootstrap3"
+    elif bs_version in ("3.3", "3_3"):
+        css_framework = "bootstrap3_3"
+    elif bs_version in (4, "4"):
+        css_framework = "bootstrap4"
+    elif bs_version in (5, "5"):
+        css_framework = "bootstrap5"
+
+    if not isinstance(bs_version, int):
+        if bs_version.isdigit():
+            bs_version = int(bs_version)
+        else:
+            bs_version = float(bs_version)
+
+    return css_framework, bs_version
+
+
+class Renderer(object):
+    """Templates of one css framework with link size, alignment, rel and
+    bulma style already applied.
+
+    Renderers are immutable and shared between Pagination objects,
+    use :func:`get_renderer` to get one. templates replaces the raw
+    templates of the css framework, the names are the keyword arguments
+    of :func:`register_css_framework`.
+    """
+
+    __slots__ = (
+        "key",
+        "templates",
+        "css_framework",
+        "bs_version",
+        "link_size",
+        "alignment",
+        "bulma_style",
+        "prev_rel",
+        "next_rel",
+        "link",
+        "current_page",
+        "gap_marker",
+        "prev_page",
+        "next_page",
+        "prev_disabled_page",
+        "next_disabled_page",
+        "start",
+        "end",
+        "nav_in_start",
+        "resource_hint",
+    )
+
+    def __init__(
+        self,
+        css_framework,
+        bs_version=None,
+        link_size="",
+        alignment="",
+        bulma_style="",
+        prev_rel="",
+        next_rel="",
+        templates=None,
+        key=None,
+    ):
+        _set = object.__setattr__
+        templates = dict(templates or {})
+        _set(self, "key", key)
+        _set(self, "templates", templates)
+        _set(self, "css_framework", css_framework)
+        _set(self, "bs_version", bs_version)
+        if link_size:
+            if css_framework == "foundation":
+                link_size = ""
+            elif css_framework == "bulma":
+                link_size = " is-{0}".format(link_size)
+            else:
+                link_size = " pagination-{0}".format(link_size)
+
+        if bulma_style:
+            bulma_style = " is-{0}".format(bulma_style)
+
+        if prev_rel:
+            prev_rel = ' rel="{}"'.format(prev_rel)
+
+        if next_rel:
+            next_rel = ' rel="{}"'.format(next_rel)
+
+        if alignment and css_framework.startswith("bootstrap"):
+            if css_framework in ("bootstrap4", "bootstrap5"):
+                if alignment == "center":
+                    alignment = " justify-content-center"
+                elif alignment in ("right", "end"):
+                    alignment = " justify-content-end"
+
+            elif css_framework == "bootstrap2":
+                alignment = " pagination-{0}".format(alignment)
+            else:
+                # v3 does not support this way
+                # use this way: <div class="text-center/right">...</div>
+                alignment = ""
+
+        if alignment and css_framework == "bulma":
+            alignment = " is-{0}".format(alignment)
+
+        _set(self, "link_size", link_size)
+        _set(self, "alignment", alignment)
+        _set(self, "bulma_style", bulma_style)
+        _set(self, "prev_rel", prev_rel)
+        _set(self, "next_rel", next_rel)
+        for name in (
+            "link",
+            "current_page",
+            "gap_marker",
+            "prev_disabled_page",
+            "next_disabled_page",
+        ):
+            _set(self, name, self.get_template(name))
+
+        # prev/next templates take (url, label) after rel is applied,
+        # templates without a label (materialize) take (url, rel)
+        for name, rel in (("prev_page", prev_rel), ("next_page", next_rel)):
+            fmt = self.get_template(name)
+            if "{2}" in fmt:
+                fmt = fmt.format("{0}", "{1}", _escape_fmt(rel))
+            else:
+                fmt = fmt.format("{0}", _escape_fmt(rel))
+
+            _set(self, name, fmt)
+
+        # start templates with {3} and {4} (bulma) hold the prev/next links
+        start = self.get_template("css_links")
+        end = self.get_template("css_links_end")
+        nav_in_start = "{3}" in start
+        if nav_in_start:
+            start = start.format(
+                _escape_fmt(link_size),
+                _escape_fmt(alignment),
+                _escape_fmt(bulma_style),
+                "{0}",
+                "{1}",
+            )
+        else:
+            start = start.format(link_size, alignment)
+            if css_framework == "foundation" and alignment:
+                start = F_ALIGNMENT.format(alignment) + start
+                end += "</div>"
+
+        _set(self, "start", start)
+        _set(self, "end", end)
+        _set(self, "nav_in_start", nav_in_start)
+        _set(self, "resource_hint", self.get_template("resource_hint"))
+
+    def get_template(self, name):
+        """Get a raw template, the replaced one or the css framework's."""
+        template = self.templates.get(name)
+        if template is not None:
+            return template
+
+        if name == "link":
+            return LINKS.get(self.css_framework, LINK)
+
+        if name == "resource_hint":
+            return RESOURCE_HINTS.get(self.css_framework, RESOURCE_HINT)
+
+        return TEMPLATES[name][self.css_framework]
+
+    def replace(self, **templates):
+        """Get the shared renderer with the same settings and some raw
+        templates replaced."""
+        if self.key is None:
+            raise ValueError("use get_renderer to get a renderer")
+
+        merged = dict(self.templates, **templates)
+        return get_renderer(*self.key[:7], templates=merged)
+
+    def __eq__(self, other):
+        if self.key is None or not isinstance(other, Renderer):
+            return self is other
+
+        return self.key == other.key
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.key) if self.key is not None else id(self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Renderer objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Renderer objects are immutable")
+
+    def wrap(self, prev_page, pages, next_page):
+        """Join the prev link, page links and next link."""
+        if self.nav_in_start:
+            s = [self.start.format(prev_page, next_page)]
+            s.extend(pages)
+        else:
+            s = [self.start, prev_page]
+            s.extend(pages)
+            s.append(next_page)
+
+        s.append(self.end)
+        return "".join(s)
+
+
+def get_renderer(
+    css_framework="bootstrap4",
+    bs_version=4,
+    link_size="",
+    alignment="",
+    bulma_style="",
+    prev_rel="",
+    next_rel="",
+    templates=None,
+):
+    """Get the shared renderer for the settings, build it on first use.
+    templates replaces raw templates of the css framework."""
+    key = (
+        css_framework,
+        bs_version,
+        link_size,
+        alignment,
+        bulma_style,
+        prev_rel,
+        next_rel,
+        tuple(sorted((templates or {}).items())),
+    )
+    renderer = _renderers.get(key)
+    if renderer is None:
+        css_framework, bs_version = _resolve_css_framework(
+            css_framework, bs_version
+        )
+        renderer = Renderer(
+            css_framework,
+            bs_version,
+            link_size,
+            alignment,
+            bulma_style,
+            prev_rel,
+            next_rel,
+            templates,
+            key,
+        )
+        if len(_renderers) >= MAX_RENDERERS:
+            _renderers.clear()
+
+        _renderers[key] = renderer
+
+    return renderer
+
+
+def register_css_framework(
+    name,
+    link,
+    current_page,
+    gap_marker,
+    prev_page,
+    next_page,
+    prev_disabled_page,
+    next_disabled_page,
+    css_links,
+    css_links_end,
+    resource_hint=None,
+):
+    """Register (or replace) a css framework.
+
+    The templates use the same placeholders as the builtin ones, e.g.
+    ``prev_page`` gets ``{0}`` url, ``{1}`` label and ``{2}`` rel and
+    ``css_links`` gets ``{0}`` link size and ``{1}`` alignment.
+    """
+    name = name.lower()
+    LINKS[name] = link
+    CURRENT_PAGES[name] = current_page
+    GAP_MARKERS[name] = gap_marker
+    PREV_PAGES[name] = prev_page
+    NEXT_PAGES[name] = next_page
+    PREV_DISABLED_PAGES[name] = prev_disabled_page
+    NEXT_DISABLED_PAGES[name] = next_disabled_page
+    CSS_LINKS[name] = css_links
+    CSS_LINKS_END[name] = css_links_end
+    if resource_hint:
+        RESOURCE_HINTS[name] = resource_hint
+    else:
+        RESOURCE_HINTS.pop(name, None)
+
+    _renderers.clear()
+
+
+def get_request_args():
+    """Get request.args updated with request.view_args.
+
+    The args are merged once per request and shared by all the callers,
+    the result is read-only.
+    """
+    req = request._get_current_object()
+    args = getattr(req, "_paginate_args", None)
+    if args is None:
+        args = req.args.copy()
+        args.update(req.view_args or {})
+        args = req._paginate_args = ImmutableMultiDict(args)
+
+    return args
+
+
+def get_url_args():
+    """Get the request args as url_for values, single values are unpacked.
+
+    The result is shared, copy it before changing.
+    """
+    req = request._get_current_object()
+    url_args = getattr(req, "_paginate_url_args", None)
+    if url_args is None:
+        url_args = {}
+        for k, v in get_request_args().lists():
+            if len(v) == 1:
+                url_args[k] = v[0]
+            else:
+                url_args[k] = v
+
+        req._paginate_url_args = url_args
+
+    return url_args
+
 
 def get_parameter(param=None, args=None, default="page"):
     if not args:
-        args = request.args.copy()
-        args.update(request.view_args.copy())
+        args = get_request_args()
 
     if not param:
         pk = "page_parameter" if default == "page" else "per_page_parameter"
         param = args.get(pk)
         if not param:
-            param = current_app.config.get(pk.upper())
+            param = get_setting(pk)
 
     return param or default
 
@@ -250,34 +766,491 @@ def get_per_page_parameter(param=None, args=None):
     return get_parameter(param, args, "per_page")
 
 
+def get_max_page(per_page, max_page=None, max_offset=None):
+    """Get the deepest page allowed by max_page and max_offset, None when
+    there is no limit."""
+    if max_offset is not None and per_page > 0:
+        offset_page = int(max_offset) // per_page + 1
+        if not max_page or offset_page < int(max_page):
+            return offset_page
+
+    return int(max_page) if max_page else None
+
+
+def get_per_page(
+    per_page, default=10, max_per_page=None, choices=None, show_all=False
+):
+    """Normalize per_page: a value not in choices gets the default, a
+    value above max_per_page gets max_per_page and a value below 1 ("show
+    all") gets the default unless show_all is allowed (0 then)."""
+    if per_page is None:
+        return default
+
+    if per_page < 1:
+        return 0 if show_all else default
+
+    if choices and per_page not in choices:
+        return default
+
+    if max_per_page and per_page > int(max_per_page):
+        return int(max_per_page)
+
+    return per_page
+
+
+def redirect_to(url):
+    """Abort the request with a redirect to url."""
+    response = current_app.response_class(status=302)
+    response.headers["Location"] = url
+    abort(response)
+
+
+def _check_page(page, last_page, action, page_href):
+    """Apply the action (clamp, 404 or redirect) to a page past
+    last_page."""
+    action = "{0}".format(action or "clamp")
+    if action == "404":
+        abort(404)
+
+    if action == "redirect":
+        redirect_to(page_href(last_page))
+
+    if action != "clamp":
+        raise ValueError("unknown page action: {0}".format(action))
+
+    return last_page
+
+
 def get_page_args(
     page_parameter=None, per_page_parameter=None, for_test=False, **kwargs
 ):
     """param order: 1. passed parameter 2. request.args 3: config value
-    for_test will return page_parameter and per_page_parameter"""
-    args = request.args.copy()
-    args.update(request.view_args.copy())
+    for_test will return page_parameter and per_page_parameter
+
+    A page deeper than max_page or max_offset (from the kwargs or the
+    config) is clamped, or aborts with 404 or a redirect to the deepest
+    page depending on max_page_action."""
+    args = get_request_args()
 
     page_name = get_page_parameter(page_parameter, args)
     per_page_name = get_per_page_parameter(per_page_parameter, args)
     for name in (page_name, per_page_name):
-        if name in kwargs:
+        if name in kwargs and name not in args:
+            if isinstance(args, ImmutableMultiDict):
+                args = args.copy()
+
             args.setdefault(name, kwargs[name])
 
     if for_test:
         return page_name, per_page_name
 
-    page = int(args.get(page_name, 1, type=int))
-    per_page = args.get(per_page_name, type=int)
-    if not per_page:
-        per_page = int(current_app.config.get("PER_PAGE", 10))
-    else:
-        per_page = int(per_page)
-
+    page, per_page = _parse_page_args(args, page_name, per_page_name, kwargs)
     offset = (page - 1) * per_page
+    if page_args_parsed.receivers:
+        page_args_parsed.send(
+            current_app._get_current_object(),
+            page=page,
+            per_page=per_page,
+            offset=offset,
+        )
+
     return page, per_page, offset
 
 
+def _parse_per_page(args, per_page_name, kwargs, show_all):
+    """Get the per_page arg normalized by :func:`get_per_page`."""
+    return get_per_page(
+        args.get(per_page_name, type=int),
+        int(kwargs.get(per_page_name) or get_setting("per_page")),
+        kwargs.get("max_per_page", get_setting("max_per_page")),
+        kwargs.get("per_page_choices", get_setting("per_page_choices")),
+        show_all,
+    )
+
+
+def _parse_page_args(args, page_name, per_page_name, kwargs):
+    """Get the normalized (page, per_page) from the args."""
+    page = max(args.get(page_name, 1, type=int), 1)
+    per_page = _parse_per_page(
+        args, per_page_name, kwargs, kwargs.get("show_all", get_setting("show_all"))
+    )
+    max_page = get_max_page(
+        per_page,
+        kwargs.get("max_page", get_setting("max_page")),
+        kwargs.get("max_offset", get_setting("max_offset")),
+    )
+    if max_page and page > max_page:
+
+        def page_href(page):
+            values = dict(get_url_args())
+            values[page_name] = page
+            return url_for(request.endpoint, **values)
+
+        page = _check_page(
+            page,
+            max_page,
+            kwargs.get("max_page_action") or get_setting("max_page_action"),
+            page_href,
+        )
+
+    return page, per_page
+
+
+def check_page_args():
+    """A before_request hook rejecting (400) or redirecting the requests
+    whose page or per_page arg is malformed or past the limits, before
+    the view queries anything::
+
+        app.before_request(check_page_args)
+
+    It is registered by :class:`Paginate` and does nothing unless
+    PAGINATION_CHECK_ARGS is **400** or **redirect**, GET and HEAD
+    requests are redirected to the normalized args, the others get 400.
+
+    The defaults given to get_page_args in a view are not seen by the hook,
+    PAGINATION_CHECK_ENDPOINTS limits it to some endpoints (a dict maps them
+    to the get_page_args kwargs, e.g. ``{"users": {"per_page": 20}}``) and
+    PAGINATION_CHECK_EXCLUDE lists the endpoints it skips.
+    """
+    action = get_setting("check_args")
+    endpoint = request.endpoint
+    if not action or endpoint is None:
+        return None
+
+    if endpoint in get_setting("check_exclude"):
+        return None
+
+    kwargs = {}
+    endpoints = get_setting("check_endpoints")
+    if endpoints is not None:
+        if endpoint not in endpoints:
+            return None
+
+        if isinstance(endpoints, dict):
+            kwargs = endpoints[endpoint] or {}
+
+    args = get_request_args()
+    page_name = get_page_parameter(None, args)
+    per_page_name = get_per_page_parameter(None, args)
+    if page_name not in request.args and per_page_name not in request.args:
+        return None
+
+    page, per_page = _parse_page_args(args, page_name, per_page_name, kwargs)
+    values = dict(get_url_args())
+    changed = False
+    for name, value in ((page_name, page), (per_page_name, per_page)):
+        if name in request.args and request.args[name] != "{0}".format(value):
+            values[name] = value
+            changed = True
+
+    if not changed:
+        return None
+
+    if action == "redirect" and request.method in ("GET", "HEAD"):
+        redirect_to(url_for(endpoint, **values))
+
+    abort(400)
+
+
+def _cursor_serializer():
+    if not current_app.secret_key:
+        raise RuntimeError("cursor pagination requires the app SECRET_KEY")
+
+    return URLSafeSerializer(current_app.secret_key, salt=CURSOR_SALT)
+
+
+def encode_cursor(key):
+    """Sign the sort key(s) of a row, the key must be json serializable."""
+    return _cursor_serializer().dumps(key)
+
+
+def decode_cursor(cursor):
+    """Get the sort key(s) from a cursor, None for a missing or bad one."""
+    if not cursor:
+        return None
+
+    try:
+        return _cursor_serializer().loads(cursor)
+    except BadSignature:
+        return None
+
+
+def get_cursor_args(after_parameter=None, before_parameter=None, **kwargs):
+    """Get (after, before, per_page) for keyset pagination, after and
+    before are the decoded sort keys or None.
+
+    Select the rows with key > after (or key < before in reverse order),
+    limit per_page + 1 to know whether there are more rows. per_page is
+    limited like in :func:`get_page_args`, without "show all"."""
+    args = get_request_args()
+    after_name = after_parameter or get_setting("after_parameter")
+    before_name = before_parameter or get_setting("before_parameter")
+    per_page_name = get_per_page_parameter(kwargs.get("per_page_parameter"), args)
+    per_page = _parse_per_page(args, per_page_name, kwargs, False)
+    after = decode_cursor(args.get(after_name))
+    before = decode_cursor(args.get(before_name))
+    return after, before, per_page
+
+
+def get_total_key(*exclude):
+    """Get a count cache key from the endpoint and the request args,
+    excluding the given args (e.g. the page parameter)."""
+    args = get_request_args()
+    items = sorted((k, tuple(v)) for k, v in args.lists() if k not in exclude)
+    return (request.endpoint,) + tuple(items)
+
+
+FUNCTION_TYPES = (
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    functools.partial,
+)
+
+
+def _value_id(value, seen, strict):
+    """Identify a closure or partial value across requests, None (or its
+    type when not strict) for objects only known by their address."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+
+    if isinstance(value, (tuple, frozenset)):
+        items = [_value_id(item, seen, strict) for item in value]
+        if None in items:
+            return None
+
+        if isinstance(value, frozenset):
+            items.sort()
+
+        return "{0}({1})".format(type(value).__name__, ", ".join(items))
+
+    if isinstance(value, (type, types.ModuleType)):
+        return "{0}.{1}".format(
+            getattr(value, "__module__", value.__name__),
+            getattr(value, "__qualname__", value.__name__),
+        )
+
+    if isinstance(value, FUNCTION_TYPES):
+        return get_count_id(value, seen, strict)
+
+    return None if strict else "<{0}>".format(type(value).__name__)
+
+
+def get_count_id(compute, seen=None, strict=True):
+    """Identify a count function across requests: its module, qualified
+    name, line, code and closure values, plus the bound object of a method
+    or the arguments of a partial.
+
+    Closure values and partial arguments other than numbers, strings,
+    tuples of them, functions and classes (e.g. a list or a query object)
+    can't be told apart across requests, the id is None then, or only
+    has their type when not strict.
+    """
+    if seen is None:
+        seen = set()
+
+    if id(compute) in seen:
+        return "..."
+
+    seen = seen | {id(compute)}
+    bound = getattr(compute, "__self__", None)
+    func = getattr(compute, "__func__", compute)
+    name = "{0}.{1}".format(
+        getattr(func, "__module__", None),
+        getattr(func, "__qualname__", type(func).__name__),
+    )
+    values = []
+    code = getattr(func, "__code__", None)
+    if code is not None:
+        consts = [c for c in code.co_consts if not isinstance(c, types.CodeType)]
+        body = code.co_code + repr(consts).encode("utf-8")
+        digest = hashlib.sha1(body).hexdigest()[:12]
+        name = "{0}:{1}:{2}".format(name, code.co_firstlineno, digest)
+        for cell in func.__closure__ or ():
+            try:
+                values.append(cell.cell_contents)
+            except ValueError:  # empty cell
+                values.append(None)
+
+    elif isinstance(func, functools.partial):
+        name = get_count_id(func.func, seen, strict)
+        if name is None:
+            return None
+
+        values.extend(func.args)
+        values.extend(sorted(func.keywords.items()))
+    elif not hasattr(func, "__qualname__"):
+        name = "{0} {1!r}".format(name, func)
+
+    if values:
+        ids = [_value_id(value, seen, strict) for value in values]
+        if None in ids:
+            return None
+
+        name = "{0} ({1})".format(name, ", ".join(ids))
+
+    if bound is not None and not isinstance(bound, (type, types.ModuleType)):
+        name = "{0} {1!r}".format(name, bound)
+
+    return name
+
+
+def get_count_cache(app=None, cache=None):
+    """Get the count cache backend, the default one is per app."""
+    if cache is not None:
+        return cache
+
+    if app is None:
+        app = current_app._get_current_object()
+
+    cache = app.extensions.get("paginate_count_cache")
+    if cache is None:
+        cache = app.extensions.setdefault("paginate_count_cache", LRUCountCache())
+
+    return cache
+
+
+def _cached_count(name, compute, key, ttl, cache, app=None, exclude=()):
+    """Get the cached value of a callable found or total, the key is
+    prefixed with the app and the count function. Without a key it is
+    made from the request args but the count function must be known by
+    :func:`get_count_id`, else it is called every time."""
+    count_id = get_count_id(compute)
+    if key is None:
+        if count_id is None:
+            return compute()
+
+        key = get_total_key(*exclude)
+
+    if count_id is None:
+        count_id = get_count_id(compute, strict=False)
+
+    if app is None:
+        app = current_app._get_current_object()
+
+    return cached_total(
+        (app.name, name, count_id, key),
+        compute,
+        ttl,
+        get_count_cache(app, cache),
+    )
+
+
+def normalize_page_args(
+    total, page_parameter=None, per_page_parameter=None, **kwargs
+):
+    """Get (page, per_page, offset, total) with the page checked against
+    the total pages before querying the page::
+
+        page, per_page, offset, total = normalize_page_args(count_users)
+        users = fetch_users(offset, per_page)
+        pagination = Pagination(total=total, page=page, per_page=per_page)
+
+    total can be a callable like the total of :class:`Pagination`, it is
+    cached with the same key. A page past the last page is clamped, or
+    aborts with 404 or a redirect to the last page depending on the
+    out_of_range_action kwarg or PAGINATION_OUT_OF_RANGE_ACTION.
+    """
+    page_name = get_page_parameter(page_parameter)
+    per_page_name = get_per_page_parameter(per_page_parameter)
+    page, per_page, offset = get_page_args(page_name, per_page_name, **kwargs)
+    if callable(total):
+        total = _cached_count(
+            "total",
+            total,
+            kwargs.get("total_key"),
+            kwargs.get("total_ttl", get_setting("total_ttl")),
+            kwargs.get("count_cache", get_setting("count_cache")),
+            exclude=(page_name, per_page_name),
+        )
+
+    if per_page < 1:
+        return page, per_page, offset, total
+
+    last_page = max((total + per_page - 1) // per_page, 1)
+    if page > last_page:
+        action = kwargs.get("out_of_range_action") or get_setting(
+            "out_of_range_action"
+        )
+        kwargs.update(
+            {
+                "page_parameter": page_name,
+                "per_page_parameter": per_page_name,
+                page_name: last_page,
+                per_page_name: per_page,
+            }
+        )
+
+        def page_href(page):
+            pagination = Pagination(total=total, **kwargs)
+            if page == 1 and not pagination.include_first_page_number:
+                page = None
+
+            return pagination.page_href(page)
+
+        page = _check_page(page, last_page, action, page_href)
+        offset = (page - 1) * per_page
+
+    return page, per_page, offset, total
+
+
+def get_page_etag(total, version=None, page_parameter=None, per_page_parameter=None):
+    """Get a (weak) etag of the current page from the endpoint, the request
+    args, page, per_page, total and an optional data version."""
+    args = get_request_args()
+    page, per_page = _parse_page_args(
+        args,
+        get_page_parameter(page_parameter, args),
+        get_per_page_parameter(per_page_parameter, args),
+        {},
+    )
+    args = sorted((k, tuple(v)) for k, v in args.lists())
+    key = repr((request.endpoint, args, page, per_page, total, version))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def not_modified(etag):
+    """Get a 304 response when If-None-Match has the etag, otherwise None.
+
+    Call it after counting and before fetching the page::
+
+        etag = get_page_etag(total)
+        response = not_modified(etag)
+        if response is not None:
+            return response
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    if not request.if_none_match.contains_weak(etag):
+        return None
+
+    response = current_app.response_class(status=304)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def set_pagination_headers(response, pagination=None, etag=None, hints=False):
+    """Add the Link header of the pagination and the weak etag, with
+    hints=True the Link header also has the resource hints."""
+    if pagination is not None:
+        link = pagination.get_link_header()
+        if hints:
+            hint = pagination.get_hint_header()
+            if hint:
+                link = "{0}, {1}".format(link, hint)
+
+        if response.headers.get("Link"):
+            link = "{0}, {1}".format(response.headers["Link"], link)
+
+        response.headers["Link"] = link
+
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+
+    return response
+
+
 def get_param_value(name, kwargs={}, default=None, cfg_name="", prefix="pagination"):
     """Get parameter value from kwargs or config"""
     config_name = cfg_name or name
@@ -288,8 +1261,124 @@ def get_param_value(name, kwargs={}, default=None, cfg_name="", prefix="paginati
     return kwargs.get(name, cfg_value)
 
 
-class Pagination(object):
-    """A simple pagination extension for flask."""
+# setting name: (config name, default value)
+SETTINGS = dict(
+    page_parameter=("PAGE_PARAMETER", None),
+    per_page_parameter=("PER_PAGE_PARAMETER", None),
+    per_page=("PER_PAGE", 10),
+    inner_window=("PAGINATION_INNER_WINDOW", 2),
+    outer_window=("PAGINATION_OUTER_WINDOW", 1),
+    prev_label=("PAGINATION_PREV_LABEL", PREV_LABEL),
+    next_label=("PAGINATION_NEXT_LABEL", NEXT_LABEL),
+    format_total=("PAGINATION_FORMAT_TOTAL", False),
+    format_number=("PAGINATION_FORMAT_NUMBER", False),
+    url_coding=("PAGINATION_URL_CODING", "utf-8"),
+    display_msg=("PAGINATION_DISPLAY_MSG", DISPLAY_MSG),
+    search_msg=("PAGINATION_SEARCH_MSG", SEARCH_MSG),
+    unknown_total_msg=("PAGINATION_UNKNOWN_TOTAL_MSG", UNKNOWN_TOTAL_MSG),
+    record_name=("PAGINATION_RECORD_NAME", RECORD_NAME),
+    css_framework=("PAGINATION_CSS_FRAMEWORK", "bootstrap4"),
+    bs_version=("PAGINATION_BS_VERSION", 4),
+    link_size=("PAGINATION_LINK_SIZE", ""),
+    alignment=("PAGINATION_ALIGNMENT", ""),
+    bulma_style=("PAGINATION_BULMA_STYLE", ""),
+    prev_rel=("PAGINATION_PREV_REL", ""),
+    next_rel=("PAGINATION_NEXT_REL", ""),
+    show_single_page=("PAGINATION_SHOW_SINGLE_PAGE", False),
+    include_first_page_number=("PAGINATION_INCLUDE_FIRST_PAGE_NUMBER", False),
+    url_template=("PAGINATION_URL_TEMPLATE", False),
+    resource_hint=("PAGINATION_RESOURCE_HINT", "prefetch"),
+    max_page=("PAGINATION_MAX_PAGE", None),
+    max_offset=("PAGINATION_MAX_OFFSET", None),
+    max_page_action=("PAGINATION_MAX_PAGE_ACTION", "clamp"),
+    max_per_page=("PAGINATION_MAX_PER_PAGE", None),
+    per_page_choices=("PAGINATION_PER_PAGE_CHOICES", None),
+    show_all=("PAGINATION_SHOW_ALL", False),
+    check_args=("PAGINATION_CHECK_ARGS", None),
+    check_endpoints=("PAGINATION_CHECK_ENDPOINTS", None),
+    check_exclude=("PAGINATION_CHECK_EXCLUDE", ()),
+    out_of_range_action=("PAGINATION_OUT_OF_RANGE_ACTION", "clamp"),
+    fetch_workers=("PAGINATION_FETCH_WORKERS", 0),
+    fetch_timeout=("PAGINATION_FETCH_TIMEOUT", None),
+    total_cap=("PAGINATION_TOTAL_CAP", None),
+    total_ttl=("PAGINATION_TOTAL_TTL", 60),
+    count_cache=("PAGINATION_COUNT_CACHE", None),
+    fragment_cache=("PAGINATION_FRAGMENT_CACHE", None),
+    after_parameter=("PAGINATION_AFTER_PARAMETER", "after"),
+    before_parameter=("PAGINATION_BEFORE_PARAMETER", "before"),
+)
+
+
+def load_settings(config):
+    """Resolve all the pagination settings from the config, the result is
+    a read-only view of a private dict."""
+    return types.MappingProxyType(
+        {
+            name: config.get(cfg_name, default)
+            for name, (cfg_name, default) in SETTINGS.items()
+        }
+    )
+
+
+def get_settings(app=None):
+    """Get the pagination settings of the app.
+
+    The settings are resolved once if the app is initialized by
+    :class:`Paginate`, otherwise they are read from the config every time.
+    """
+    if app is None:
+        app = current_app._get_current_object()
+
+    settings = app.extensions.get("paginate")
+    if settings is None:
+        return load_settings(app.config)
+
+    return settings
+
+
+def get_setting(name, app=None):
+    """Get one pagination setting of the app, see :func:`get_settings`."""
+    if app is None:
+        app = current_app._get_current_object()
+
+    settings = app.extensions.get("paginate")
+    if settings is None:
+        cfg_name, default = SETTINGS[name]
+        return app.config.get(cfg_name, default)
+
+    return settings[name]
+
+
+class Paginate(object):
+    """Resolve the pagination settings of an app once::
+
+        app = Flask(__name__)
+        Paginate(app)
+
+    Call :meth:`refresh` after changing the config at runtime.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions["paginate"] = load_settings(app.config)
+        if check_page_args not in app.before_request_funcs.get(None, ()):
+            app.before_request(check_page_args)
+
+    def refresh(self, app=None):
+        if app is None:
+            app = current_app._get_current_object()
+
+        app.extensions["paginate"] = load_settings(app.config)
+
+
+class BasePagination(object):
+    """The pagination logic shared by :class:`Pagination` and
+    :class:`LazyPagination`."""
+
+    __slots__ = ()
 
     def __init__(self, found=0, **kwargs):
         """Detail parameters.
@@ -358,11 +1447,80 @@ class Pagination(object):
 
             **include_first_page_number**: include 1 for first page or not
 
+            **url_template**: build the page url once and substitute the \
+            page number for the other links, default is False
+
+            **max_per_page**: the largest per_page, default is None \
+            (no limit)
+
+            **per_page_choices**: the allowed per_page values, the others \
+            get the default per_page, default is None (any value)
+
+            **max_page**: the deepest page, default is None (no limit)
+
+            **max_offset**: the largest offset, limits the page like \
+            max_page, default is None (no limit)
+
+            **max_page_action**: what to do with a page past the limit, \
+            **clamp** it, **404** or **redirect** to the deepest page, \
+            default is **clamp**
+
+            **resource_hint**: rel of the resource hints of the next and \
+            previous pages, **prefetch** or **prerender**, \
+            default is **prefetch**
+
+            **has_more**: whether there is a next page, use it instead of \
+            total to skip counting (fetch per_page + 1 rows to know it)
+
+            **page_items**: how many records on the current page, used by \
+            info when has_more is given
+
+            **unknown_total_msg**: text for pagination information when \
+            has_more is given
+
+            **found_is_lower_bound**: found (or total) is a lower bound, \
+            info shows it like **10000+** and there is no last page link
+
+            **total_cap**: found (or total) above it is capped and used as \
+            a lower bound, count at most total_cap + 1 records
+
+            **total_key**: the count cache key when found or total is a \
+            callable, default is the endpoint with the request args \
+            except page and per_page, it is always combined with the app \
+            and the callable (see :func:`get_count_id`)
+
+            **total_ttl**: seconds to cache a callable found or total, \
+            default is 60
+
+            **count_cache**: count cache backend, default is an in-process \
+            LRU cache per app
+
+            **fragment_cache**: a FragmentCache to reuse the rendered links \
+            and info, default is None
+
+            **app**, **endpoint**, **url_args** and **url_adapter**: build \
+            the urls without a request, see :func:`iter_page_links`
+
         """
+        start = time.perf_counter() if pagination_created.receivers else None
+        self.urls_built = 0
         self.found = found
+        self.app = kwargs.get("app")
+        self.url_adapter = kwargs.get("url_adapter")
+        self.url_endpoint = kwargs.get("endpoint")
+        self.url_args = kwargs.get("url_args")
+        settings = get_settings(self.app)
+        values = dict(settings, **kwargs)
         page_parameter = kwargs.get("page_parameter")
         if not page_parameter:
-            page_parameter = get_page_parameter()
+            if self.url_args is None:
+                page_parameter = get_page_parameter()
+            else:
+                page_parameter = (
+                    self.url_args.get("page_parameter")
+                    or settings["page_parameter"]
+                    or "page"
+                )
 
         self.page_parameter = page_parameter
         self.page = int(kwargs.get(self.page_parameter, 1))
@@ -372,134 +1530,190 @@ class Pagination(object):
 
         per_page_param = kwargs.get("per_page_parameter")
         if not per_page_param:
-            per_page_param = get_per_page_parameter()
+            if self.url_args is None:
+                per_page_param = get_per_page_parameter()
+            else:
+                per_page_param = (
+                    self.url_args.get("per_page_parameter")
+                    or settings["per_page_parameter"]
+                    or "per_page"
+                )
 
         self.per_page_parameter = per_page_param
-        self.per_page = int(
-            get_param_value(per_page_param, kwargs, 10, cfg_name="per_page", prefix="")
+        self.per_page = get_per_page(
+            int(kwargs.get(per_page_param, settings["per_page"])),
+            int(settings["per_page"]),
+            values["max_per_page"],
+            values["per_page_choices"],
+            show_all=True,
         )
         self.is_disabled = self.per_page < 1
+        self.max_page = None
+        max_page_action = values["max_page_action"]
+        if not self.is_disabled:
+            self.max_page = get_max_page(
+                self.per_page, values["max_page"], values["max_offset"]
+            )
+
+        redirect_page = None
+        if self.max_page and self.page > self.max_page:
+            if max_page_action == "redirect":
+                redirect_page = self.max_page
+            else:
+                _check_page(self.page, self.max_page, max_page_action, None)
+
+            self.page = self.max_page
+
         self.skip = (self.page - 1) * self.per_page
-        self.inner_window = int(get_param_value("inner_window", kwargs, 2))
-        self.outer_window = int(get_param_value("outer_window", kwargs, 1))
-        self.prev_label = get_param_value("prev_label", kwargs, PREV_LABEL)
-        self.next_label = get_param_value("next_label", kwargs, NEXT_LABEL)
+        self.inner_window = int(values["inner_window"])
+        self.outer_window = int(values["outer_window"])
+        self.prev_label = values["prev_label"]
+        self.next_label = values["next_label"]
         self.search = kwargs.get("search", False)
         self.total = kwargs.get("total", 0)
-        self.format_total = get_param_value("format_total", kwargs, False)
-        self.format_number = get_param_value("format_number", kwargs, False)
-        self.url_coding = get_param_value("url_coding", kwargs, "utf-8")
-        self.display_msg = get_param_value("display_msg", kwargs, DISPLAY_MSG)
-        self.search_msg = get_param_value("search_msg", kwargs, SEARCH_MSG)
-        self.record_name = get_param_value("record_name", kwargs, RECORD_NAME)
-        self.css_framework = get_param_value(
-            "css_framework", kwargs, "bootstrap4"
-        ).lower()
-        if self.css_framework not in CURRENT_PAGES:
-            self.css_framework = "bootstrap4"
-
-        if self.css_framework.startswith("bootstrap"):
-            bs_version = self.css_framework[9:]
-            if bs_version in ("3_3", "3.3"):
-                self.bs_version = "3.3"
-            elif bs_version:
-                self.bs_version = bs_version
-            else:
-                self.bs_version = get_param_value("bs_version", kwargs, 4)
-                if self.bs_version in (2, "2"):
-                    self.css_framework = "bootstrap"
-                elif self.bs_version in (3, "3"):
-                    self.css_framework = "bootstrap3"
-                elif self.bs_version in ("3.3", "3_3"):
-                    self.css_framework = "bootstrap3_3"
-                elif self.bs_version in (4, "4"):
-                    self.css_framework = "bootstrap4"
-                elif self.bs_version in (5, "5"):
-                    self.css_framework = "bootstrap5"
-
-            if not isinstance(self.bs_version, int):
-                if self.bs_version.isdigit():
-                    self.bs_version = int(self.bs_version)
-                else:
-                    self.bs_version = float(self.bs_version)
-
-        self.link_size = get_param_value("link_size", kwargs, "")
-        if self.link_size:
-            if self.css_framework == "foundation":
-                self.link_size = ""
-            elif self.css_framework == "bulma":
-                self.link_size = " is-{0}".format(self.link_size)
-            else:
-                self.link_size = " pagination-{0}".format(self.link_size)
-
-        self.bulma_style = get_param_value("bulma_style", kwargs, "")
-        if self.bulma_style:
-            self.bulma_style = " is-{0}".format(self.bulma_style)
-
-        self.prev_rel = get_param_value("prev_rel", kwargs, "")
-        if self.prev_rel:
-            self.prev_rel = ' rel="{}"'.format(self.prev_rel)
-
-        self.next_rel = get_param_value("next_rel", kwargs, "")
-        if self.next_rel:
-            self.next_rel = ' rel="{}"'.format(self.next_rel)
-
-        self.alignment = get_param_value("alignment", kwargs, "")
-        if self.alignment and self.css_framework.startswith("bootstrap"):
-            if self.css_framework in ("bootstrap4", "bootstrap5"):
-                if self.alignment == "center":
-                    self.alignment = " justify-content-center"
-                elif self.alignment in ("right", "end"):
-                    self.alignment = " justify-content-end"
-
-            elif self.css_framework == "bootstrap2":
-                self.alignment = " pagination-{0}".format(self.alignment)
-            else:
-                # v3 does not support this way
-                # use this way: <div class="text-center/right">...</div>
-                self.alignment = ""
-
-        if self.alignment and self.css_framework == "bulma":
-            self.alignment = " is-{0}".format(self.alignment)
+        if callable(self.found) or callable(self.total):
+            for name in ("found", "total"):
+                compute = getattr(self, name)
+                if callable(compute):
+                    value = _cached_count(
+                        name,
+                        compute,
+                        kwargs.get("total_key"),
+                        values["total_ttl"],
+                        values["count_cache"],
+                        self.app,
+                        (self.page_parameter, self.per_page_parameter),
+                    )
+                    setattr(self, name, value)
+
+        self.has_more = kwargs.get("has_more")
+        self.total_cap = values["total_cap"]
+        self.found_is_lower_bound = kwargs.get("found_is_lower_bound", False)
+        if self.total_cap:
+            if self.search and self.found > self.total_cap:
+                self.found = self.total_cap
+                self.found_is_lower_bound = True
+            elif not self.search and self.total > self.total_cap:
+                self.total = self.total_cap
+                self.found_is_lower_bound = True
+        self.page_items = kwargs.get("page_items")
+        self.format_total = values["format_total"]
+        self.format_number = values["format_number"]
+        self.url_coding = values["url_coding"]
+        self.display_msg = values["display_msg"]
+        self.search_msg = values["search_msg"]
+        self.unknown_total_msg = values["unknown_total_msg"]
+        self.record_name = values["record_name"]
+        self.renderer = get_renderer(
+            values["css_framework"],
+            values["bs_version"],
+            link_size=values["link_size"],
+            alignment=values["alignment"],
+            bulma_style=values["bulma_style"],
+            prev_rel=values["prev_rel"],
+            next_rel=values["next_rel"],
+        )
+        self.css_framework = self.renderer.css_framework
+        if self.renderer.bs_version is not None:
+            self.bs_version = self.renderer.bs_version
+
+        self.link_size = self.renderer.link_size
+        self.alignment = self.renderer.alignment
+        self.bulma_style = self.renderer.bulma_style
+        self.prev_rel = self.renderer.prev_rel
+        self.next_rel = self.renderer.next_rel
+        overrides = self._template_overrides()
+        if overrides:
+            self.renderer = self.renderer.replace(
+                **dict((name, getattr(self, attr)) for attr, name in overrides)
+            )
 
         self.href = kwargs.get("href")
         self.anchor = kwargs.get("anchor")
-        self.show_single_page = get_param_value("show_single_page", kwargs, False)
-
-        self.link = LINK
-        if self.css_framework == "bootstrap4":
-            self.link = BS4_LINK
-        elif self.css_framework == "bootstrap5":
-            self.link = BS5_LINK
-        elif self.css_framework == "semantic":
-            self.link = SEMANTIC_LINK
-        elif self.css_framework == "bulma":
-            self.link = BULMA_LINK
-        elif self.css_framework == "materialize":
-            self.link = MATERIALIZE_LINK
-
-        self.current_page_fmt = CURRENT_PAGES[self.css_framework]
-        self.link_css_fmt = CSS_LINKS[self.css_framework]
-        self.gap_marker_fmt = GAP_MARKERS[self.css_framework]
-        self.prev_disabled_page_fmt = PREV_DISABLED_PAGES[self.css_framework]
-        self.next_disabled_page_fmt = NEXT_DISABLED_PAGES[self.css_framework]
-        self.prev_page_fmt = PREV_PAGES[self.css_framework]
-        self.next_page_fmt = NEXT_PAGES[self.css_framework]
-        self.css_end_fmt = CSS_LINKS_END[self.css_framework]
-        self.include_first_page_number = get_param_value(
-            "include_first_page_number", kwargs, False
-        )
+        self.show_single_page = values["show_single_page"]
+        self.include_first_page_number = values["include_first_page_number"]
+        self.url_template = values["url_template"]
+        self.resource_hint = values["resource_hint"]
+        self.fragment_cache = values["fragment_cache"]
+        self._url_parts = None
         self.init_values()
+        if redirect_page is not None:
+            redirect_to(self.page_href(redirect_page))
+
+        if start is not None:
+            self._send(pagination_created, start)
+
+    def _send(self, signal, start, urls_built=0):
+        signal.send(
+            self.app or current_app._get_current_object(),
+            pagination=self,
+            css_framework=self.css_framework,
+            page=self.page,
+            per_page=self.per_page,
+            total_pages=self.total_pages,
+            urls_built=self.urls_built - urls_built,
+            elapsed_ns=int((time.perf_counter() - start) * 1e9),
+        )
+
+    def _build_url(self, page):
+        self.urls_built += 1
+        self.args[self.page_parameter] = page
+        if self.url_adapter is not None:
+            url = self.url_adapter.build(self.endpoint, self.args)
+            if self.anchor:
+                url += "#" + url_quote(self.anchor, safe="%!#$&'()*+,/:;=?@")
+
+            return url
+
+        if self.anchor:
+            return url_for(self.endpoint, _anchor=self.anchor, **self.args)
+
+        return url_for(self.endpoint, **self.args)
+
+    def _template_url(self, page):
+        """Substitute the page into the url built with PAGE_SENTINEL.
+
+        Page 1 and no page may map to another rule (e.g. defaults),
+        so they are always built by url_for. The first substituted url is
+        checked against url_for as a converter may format the page (e.g.
+        fixed digits), url_for is used when they differ.
+        """
+        if page is None or page == 1:
+            return self._build_url(page)
+
+        url, parts, checked = self._get_url_parts()
+        if not parts:
+            return self._build_url(page)
+
+        href = "{0}{1}{2}".format(parts[0], page, parts[1])
+        if not checked:
+            built = self._build_url(page)
+            self._url_parts = (url, parts if built == href else (), True)
+            return built
+
+        return href
+
+    def _get_url_parts(self):
+        """Get the url built with PAGE_SENTINEL, its parts around the page
+        (() when the page can't be found in it) and whether the parts were
+        checked."""
+        if self._url_parts is None:
+            url = self._build_url(PAGE_SENTINEL)
+            parts = url.split(PAGE_SENTINEL)
+            self._url_parts = (url, parts if len(parts) == 2 else (), False)
+
+        return self._url_parts
+
+    def page_href(self, page, template=None):
+        if template is None:
+            template = self.url_template
 
-    def page_href(self, page):
         if self.href:
             url = self.href.format(page or 1)
+        elif template:
+            url = self._template_url(page)
         else:
-            self.args[self.page_parameter] = page
-            if self.anchor:
-                url = url_for(self.endpoint, _anchor=self.anchor, **self.args)
-            else:
-                url = url_for(self.endpoint, **self.args)
+            url = self._build_url(page)
 
         # Need to return a unicode object
         if self.url_coding:
@@ -507,27 +1721,77 @@ class Pagination(object):
 
         return url
 
-    def init_values(self):
+    def init_pages(self):
         current_total = self.found if self.search else self.total
         if self.is_disabled:
             self.total_pages = 1
             self.has_prev = self.has_next = False
+        elif self.has_more is not None:
+            # the total is unknown, the next page is the last known one
+            self.total_pages = self.page + 1 if self.has_more else self.page
+            self.has_prev = self.page > 1
+            self.has_next = bool(self.has_more)
         else:
             pages = divmod(current_total, self.per_page)
             self.total_pages = pages[0] + 1 if pages[1] else pages[0]
+            if self.found_is_lower_bound and self.total_pages < self.page:
+                # the current page is past the known total
+                self.total_pages = self.page
+
             self.has_prev = self.page > 1
-            self.has_next = self.page < self.total_pages
+            self.has_next = (
+                self.page < self.total_pages or self.found_is_lower_bound
+            )
 
-        args = request.args.copy()
-        args.update(request.view_args.copy())
-        self.args = {}
-        for k, v in args.lists():
-            if len(v) == 1:
-                self.args[k] = v[0]
-            else:
-                self.args[k] = v
+        if self.max_page and self.total_pages >= self.max_page:
+            # the pages past the limit are not linked
+            self.total_pages = self.max_page
+            self.has_next = self.page < self.max_page
 
-        self.endpoint = request.endpoint
+    def init_values(self):
+        self.init_pages()
+        if self.url_args is None:
+            self.args = dict(get_url_args())
+        else:
+            self.args = dict(self.url_args)
+
+        self.endpoint = self.url_endpoint or request.endpoint
+
+    def _template_property(name):
+        def fget(self):
+            return self.renderer.get_template(name)
+
+        def fset(self, value):
+            self.renderer = self.renderer.replace(**{name: value})
+
+        return property(fget, fset)
+
+    # the raw templates, setting one (or overriding it in a subclass)
+    # replaces it for this pagination
+    link = _template_property("link")
+    current_page_fmt = _template_property("current_page")
+    link_css_fmt = _template_property("css_links")
+    gap_marker_fmt = _template_property("gap_marker")
+    prev_disabled_page_fmt = _template_property("prev_disabled_page")
+    next_disabled_page_fmt = _template_property("next_disabled_page")
+    prev_page_fmt = _template_property("prev_page")
+    next_page_fmt = _template_property("next_page")
+    css_end_fmt = _template_property("css_links_end")
+    del _template_property
+
+    @classmethod
+    def _template_overrides(cls):
+        """Get the (attribute, template name) pairs of the templates
+        overridden by the class."""
+        overrides = _template_overrides.get(cls)
+        if overrides is None:
+            overrides = _template_overrides[cls] = tuple(
+                (attr, name)
+                for attr, name in TEMPLATE_ATTRS
+                if getattr(cls, attr) is not getattr(BasePagination, attr)
+            )
+
+        return overrides
 
     @property
     def prev_page(self):
@@ -537,49 +1801,52 @@ class Pagination(object):
                 page = None
 
             url = self.page_href(page)
-            if self.css_framework == "materialize":
-                args = (url, self.prev_rel)
-            else:
-                args = (url, self.prev_label, self.prev_rel)
+            return self.renderer.prev_page.format(url, self.prev_label)
 
-            return self.prev_page_fmt.format(*args)
-
-        return self.prev_disabled_page_fmt.format(self.prev_label)
+        return self.renderer.prev_disabled_page.format(self.prev_label)
 
     @property
     def next_page(self):
         if self.has_next:
             url = self.page_href(self.page + 1)
-            if self.css_framework == "materialize":
-                args = (url, self.next_rel)
-            else:
-                args = (url, self.next_label, self.next_rel)
-
-            return self.next_page_fmt.format(*args)
+            return self.renderer.next_page.format(url, self.next_label)
 
-        return self.next_disabled_page_fmt.format(self.next_label)
+        return self.renderer.next_disabled_page.format(self.next_label)
 
     @property
     def first_page(self):
         # current page is first page
         if self.has_prev:
             if self.include_first_page_number:
-                return self.link.format(self.page_href(1), 1)
+                return self.renderer.link.format(self.page_href(1), 1)
 
-            return self.link.format(self.page_href(None), 1)
+            return self.renderer.link.format(self.page_href(None), 1)
 
-        return self.current_page_fmt.format(1)
+        return self.renderer.current_page.format(1)
 
     @property
     def last_page(self):
         if self.has_next:
             url = self.page_href(self.total_pages)
-            return self.link.format(url, self.total_pages)
+            return self.renderer.link.format(url, self.total_pages)
 
-        return self.current_page_fmt.format(self.page)
+        return self.renderer.current_page.format(self.page)
 
     @property
     def pages(self):
+        pages = self.window_pages()
+        if self.found_is_lower_bound and not self.is_disabled:
+            # the real last page is unknown, end with a gap instead
+            pages = list(pages)
+            gap = len(pages) - 1 - pages[::-1].index(None) if None in pages else -1
+            if gap >= 0 and all(p > self.page for p in pages[gap + 1 :]):
+                del pages[gap + 1 :]
+            else:
+                pages.append(None)
+
+        return pages
+
+    def window_pages(self):
         if self.total_pages < self.inner_window * 2 - 1:
             return range(1, self.total_pages + 1)
 
@@ -621,7 +1888,7 @@ class Pagination(object):
 
     def single_page(self, page):
         if page == self.page:
-            return self.current_page_fmt.format(page)
+            return self.renderer.current_page.format(page)
 
         if page == 1:
             return self.first_page
@@ -629,79 +1896,279 @@ class Pagination(object):
         if page == self.total_pages:
             return self.last_page
 
-        return self.link.format(self.page_href(page), page)
+        return self.renderer.link.format(self.page_href(page), page)
 
     def _get_single_page_link(self):
-        s = [self.link_css_fmt.format(self.link_size, self.alignment)]
-        s.append(self.prev_page)
-        s.append(self.single_page(1))
-        s.append(self.next_page)
-        s.append(self.css_end_fmt)
-        if self.css_framework == "foundation" and self.alignment:
-            s.insert(0, F_ALIGNMENT.format(self.alignment))
-            s.append("</div>")
+        s = self.renderer.wrap(
+            self.prev_page, [self.single_page(1)], self.next_page
+        )
+        return Markup(s)
+
+    def _info_key(self):
+        return (
+            "info",
+            self.page,
+            self.per_page,
+            self.total,
+            self.found,
+            self.search,
+            self.has_more,
+            self.page_items,
+            self.found_is_lower_bound,
+            self.display_msg,
+            self.search_msg,
+            self.unknown_total_msg,
+            self.record_name,
+            self.format_total,
+            self.format_number,
+        )
 
-        return Markup("".join(s))
+    def _links_key(self):
+        # the url of a page has what url_defaults, the subdomain or the
+        # script root add, its args are sorted as the order doesn't matter
+        if self.href:
+            url, query = self.href, ()
+        else:
+            url, _, query = self._get_url_parts()[0].partition("?")
+            query = tuple(sorted(query.partition("#")[0].split("&")))
+
+        return (
+            "links",
+            self.renderer,
+            self.page,
+            self.total_pages,
+            self.has_next,
+            self.found_is_lower_bound,
+            self.inner_window,
+            self.outer_window,
+            self.prev_label,
+            self.next_label,
+            self.show_single_page,
+            self.include_first_page_number,
+            self.href,
+            self.anchor,
+            self.url_coding,
+            self.page_parameter,
+            self.endpoint,
+            url,
+            query,
+        )
 
     @property
     def links(self):
         """Get all the pagination links."""
+        if not links_rendered.receivers:
+            return self._get_links()
+
+        start, urls_built = time.perf_counter(), self.urls_built
+        links = self._get_links()
+        self._send(links_rendered, start, urls_built)
+        return links
+
+    @property
+    def info(self):
+        """Get the pagination information."""
+        if not info_rendered.receivers:
+            return self._get_info()
+
+        start = time.perf_counter()
+        info = self._get_info()
+        self._send(info_rendered, start, self.urls_built)
+        return info
+
+    def _get_links(self):
+        if self.fragment_cache is None:
+            return self.render_links()
+
+        key = self._links_key()
+        links = self.fragment_cache.get(key)
+        if links is None:
+            links = self.render_links()
+            self.fragment_cache.set(key, links)
+
+        return links
+
+    def _get_info(self):
+        if self.fragment_cache is None:
+            return self.render_info()
+
+        key = self._info_key()
+        info = self.fragment_cache.get(key)
+        if info is None:
+            info = self.render_info()
+            self.fragment_cache.set(key, info)
+
+        return info
+
+    def render_links(self):
         if self.total_pages <= 1:
             if self.show_single_page:
                 return self._get_single_page_link()
 
             return ""
 
-        if self.css_framework == "bulma":
-            s = [
-                self.link_css_fmt.format(
-                    self.link_size,
-                    self.alignment,
-                    self.bulma_style,
-                    self.prev_page,
-                    self.next_page,
-                )
-            ]
-            for page in self.pages:
-                s.append(self.single_page(page) if page else self.gap_marker_fmt)
-
-            s.append(self.css_end_fmt)
+        gap_marker = self.renderer.gap_marker
+        pages = [
+            self.single_page(page) if page else gap_marker for page in self.pages
+        ]
+        return Markup(self.renderer.wrap(self.prev_page, pages, self.next_page))
+
+    def get_start_end(self):
+        """Get the numbers of the first and last records on the page."""
+        if self.has_more is not None:
+            if self.page_items is None:
+                count = 0 if self.is_disabled else self.per_page
+            else:
+                count = self.page_items
+
+            start = self.skip + 1
+            end = self.skip + count
+            if count < 1:
+                # an empty page, like an empty listing
+                start = end = 0
+        elif self.is_disabled:
+            start = 1
+            end = self.found if self.search else self.total
+        elif self.found_is_lower_bound:
+            start = self.skip + 1
+            end = self.skip + self.per_page
         else:
-            s = [self.link_css_fmt.format(self.link_size, self.alignment)]
-            s.append(self.prev_page)
-            for page in self.pages:
-                s.append(self.single_page(page) if page else self.gap_marker_fmt)
+            start = 1 + (self.page - 1) * self.per_page
+            end = start + self.per_page - 1
+            if end > self.total:
+                end = self.found if self.search else self.total
 
-            s.append(self.next_page)
-            s.append(self.css_end_fmt)
-            if self.css_framework == "foundation" and self.alignment:
-                s.insert(0, F_ALIGNMENT.format(self.alignment))
-                s.append("</div>")
+            if start > self.total:
+                start = self.found if self.search else self.total
 
-        return Markup("".join(s))
+        return start, end
 
-    @property
-    def info(self):
-        """Get the pagination information."""
+    def to_dict(self):
+        """Get the pagination data without html, e.g. for json responses.
+
+        The page urls are built like the links, see url_template.
+        """
+        href = self.page_href
+        first_page = 1 if self.include_first_page_number else None
+        prev_page = self.page - 1
+        if prev_page == 1:
+            prev_page = first_page
+
+        pages = []
+        for page in self.pages:
+            if page is None:
+                pages.append(None)
+            else:
+                url = href(first_page if page == 1 else page)
+                pages.append(dict(page=page, url=url, current=page == self.page))
+
+        exact_last = self.has_more is None and not self.found_is_lower_bound
+        start, end = self.get_start_end()
+        return dict(
+            page=self.page,
+            per_page=self.per_page,
+            offset=self.skip,
+            total=self.total,
+            found=self.found,
+            total_pages=self.total_pages,
+            found_is_lower_bound=self.found_is_lower_bound,
+            has_prev=self.has_prev,
+            has_next=self.has_next,
+            start=start,
+            end=end,
+            prev_url=href(prev_page) if self.has_prev else None,
+            next_url=href(self.page + 1) if self.has_next else None,
+            first_url=href(first_page),
+            last_url=href(self.total_pages) if exact_last else None,
+            pages=pages,
+        )
+
+    def get_link_header(self):
+        """Get the RFC 8288 Link header value of the first, prev, next and
+        last pages."""
+        first_page = 1 if self.include_first_page_number else None
+        links = [(self.page_href(first_page), "first")]
+        if self.has_prev:
+            prev_page = self.page - 1
+            if prev_page == 1:
+                prev_page = first_page
+
+            links.append((self.page_href(prev_page), "prev"))
+
+        if self.has_next:
+            links.append((self.page_href(self.page + 1), "next"))
+
+        if self.has_more is None and not self.found_is_lower_bound:
+            links.append((self.page_href(self.total_pages), "last"))
+
+        return ", ".join('<{0}>; rel="{1}"'.format(*link) for link in links)
+
+    def get_hint_urls(self):
+        """Get the urls of the next and previous pages, next first."""
+        urls = []
+        if self.has_next:
+            urls.append(self.page_href(self.page + 1))
+
+        if self.has_prev:
+            page = self.page - 1
+            if page == 1 and not self.include_first_page_number:
+                page = None
+
+            urls.append(self.page_href(page))
+
+        return urls
+
+    def resource_hints(self, rel=None):
+        """Get the <link> tags of the next and previous pages for the
+        html head, rel defaults to the resource_hint setting."""
+        rel = rel or self.resource_hint
+        fmt = self.renderer.resource_hint
+        return Markup("".join(fmt.format(rel, url) for url in self.get_hint_urls()))
+
+    def speculation_rules(self, action=None, eagerness="moderate"):
+        """Get a speculation rules script of the next and previous pages,
+        action defaults to the resource_hint setting."""
+        urls = self.get_hint_urls()
+        if not urls:
+            return Markup("")
+
+        rules = {
+            action or self.resource_hint: [
+                dict(source="list", urls=urls, eagerness=eagerness)
+            ]
+        }
+        s = json.dumps(rules, sort_keys=True).replace("</", "<\\/")
+        return Markup('<script type="speculationrules">{0}</script>'.format(s))
+
+    def get_hint_header(self, rel=None):
+        """Get the Link header value hinting the next and previous pages,
+        proxies and CDNs may send it early as 103 Early Hints. rel defaults
+        to the resource_hint setting."""
+        rel = rel or self.resource_hint
+        return ", ".join(
+            "<{0}>; rel={1}".format(url, rel) for url in self.get_hint_urls()
+        )
+
+    def render_info(self):
         s = ['<div class="pagination-page-info">']
         page_msg = self.search_msg if self.search else self.display_msg
+        found_text = self.found
         if self.format_total:
             total_text = "{0:,}".format(self.total)
         else:
             total_text = "{0}".format(self.total)
 
-        if self.is_disabled:
-            start = 1
-            end = self.found if self.search else self.total
-        else:
-            start = 1 + (self.page - 1) * self.per_page
-            end = start + self.per_page - 1
-            if end > self.total:
-                end = self.found if self.search else self.total
+        if self.found_is_lower_bound:
+            if self.search:
+                fmt = "{0:,}+" if self.format_total else "{0}+"
+                found_text = fmt.format(self.found)
+            else:
+                total_text += "+"
 
-            if start > self.total:
-                start = self.found if self.search else self.total
+        if self.has_more is not None:
+            page_msg = self.unknown_total_msg
 
+        start, end = self.get_start_end()
         if self.format_number:
             start_text = "{0:,}".format(start)
             end_text = "{0:,}".format(end)
@@ -711,7 +2178,7 @@ class Pagination(object):
 
         s.append(
             page_msg.format(
-                found=self.found,
+                found=found_text,
                 total=total_text,
                 start=start_text,
                 end=end_text,
@@ -720,3 +2187,381 @@ class Pagination(object):
         )
         s.append("</div>")
         return Markup("".join(s))
+
+
+class Pagination(BasePagination):
+    """A simple pagination extension for flask."""
+
+
+class LazyPagination(BasePagination):
+    """A slotted Pagination which reads the request args and endpoint only
+    when a link is rendered, and computes ``pages``, ``links`` and ``info``
+    once.
+
+    The parameters are the same as :class:`Pagination`, but the object
+    should not be changed after it is created.
+    """
+
+    __slots__ = (
+        "found",
+        "app",
+        "url_adapter",
+        "url_endpoint",
+        "url_args",
+        "page_parameter",
+        "page",
+        "per_page_parameter",
+        "per_page",
+        "is_disabled",
+        "skip",
+        "inner_window",
+        "outer_window",
+        "prev_label",
+        "next_label",
+        "search",
+        "total",
+        "has_more",
+        "page_items",
+        "total_cap",
+        "found_is_lower_bound",
+        "format_total",
+        "format_number",
+        "url_coding",
+        "display_msg",
+        "search_msg",
+        "unknown_total_msg",
+        "record_name",
+        "renderer",
+        "css_framework",
+        "bs_version",
+        "link_size",
+        "alignment",
+        "bulma_style",
+        "prev_rel",
+        "next_rel",
+        "href",
+        "anchor",
+        "show_single_page",
+        "include_first_page_number",
+        "url_template",
+        "resource_hint",
+        "max_page",
+        "fragment_cache",
+        "urls_built",
+        "total_pages",
+        "has_prev",
+        "has_next",
+        "_url_parts",
+        "_args",
+        "_endpoint",
+        "_pages",
+        "_links",
+        "_info",
+    )
+
+    def init_values(self):
+        self.init_pages()
+        self._args = self._endpoint = None
+        self._pages = self._links = self._info = None
+
+    @property
+    def args(self):
+        if self._args is None:
+            if self.url_args is None:
+                self._args = dict(get_url_args())
+            else:
+                self._args = dict(self.url_args)
+
+        return self._args
+
+    @property
+    def endpoint(self):
+        if self._endpoint is None:
+            self._endpoint = self.url_endpoint or request.endpoint
+
+        return self._endpoint
+
+    @property
+    def pages(self):
+        if self._pages is None:
+            self._pages = BasePagination.pages.fget(self)
+
+        return self._pages
+
+    @property
+    def links(self):
+        """Get all the pagination links."""
+        if self._links is None:
+            self._links = BasePagination.links.fget(self)
+
+        return self._links
+
+    @property
+    def info(self):
+        """Get the pagination information."""
+        if self._info is None:
+            self._info = BasePagination.info.fget(self)
+
+        return self._info
+
+
+class CursorPagination(object):
+    """Keyset (seek) pagination, the prev/next links hold signed cursors
+    instead of page numbers, see :func:`get_cursor_args`."""
+
+    def __init__(self, first_key=None, last_key=None, has_next=False, **kwargs):
+        """Detail parameters.
+
+            **first_key**: sort key(s) of the first row on the page
+
+            **last_key**: sort key(s) of the last row on the page
+
+            **has_next**: whether there are rows after the last row
+
+            **has_prev**: whether there are rows before the first row, \
+            default is whether the request has a valid cursor
+
+            **after_parameter**: the GET parameter of the next cursor, \
+            default is 'after'
+
+            **before_parameter**: the GET parameter of the previous cursor, \
+            default is 'before'
+
+            **prev_label**, **next_label**, **css_framework**, \
+            **bs_version**, **link_size**, **alignment**, **bulma_style**, \
+            **prev_rel**, **next_rel**, **anchor**, **url_coding** and \
+            **show_single_page** are the same as :class:`Pagination`
+
+        """
+        settings = get_settings()
+        values = dict(settings, **kwargs)
+        self.first_key = first_key
+        self.last_key = last_key
+        self.after_parameter = values["after_parameter"]
+        self.before_parameter = values["before_parameter"]
+        self.has_next = bool(has_next and last_key is not None)
+        has_prev = kwargs.get("has_prev")
+        if has_prev is None:
+            args = get_request_args()
+            has_prev = (
+                decode_cursor(args.get(self.after_parameter)) is not None
+                or decode_cursor(args.get(self.before_parameter)) is not None
+            )
+
+        self.has_prev = bool(has_prev and first_key is not None)
+        self.prev_label = values["prev_label"]
+        self.next_label = values["next_label"]
+        self.url_coding = values["url_coding"]
+        self.show_single_page = values["show_single_page"]
+        self.anchor = kwargs.get("anchor")
+        self.renderer = get_renderer(
+            values["css_framework"],
+            values["bs_version"],
+            link_size=values["link_size"],
+            alignment=values["alignment"],
+            bulma_style=values["bulma_style"],
+            prev_rel=values["prev_rel"],
+            next_rel=values["next_rel"],
+        )
+        self.css_framework = self.renderer.css_framework
+
+    @property
+    def prev_cursor(self):
+        return encode_cursor(self.first_key) if self.has_prev else None
+
+    @property
+    def next_cursor(self):
+        return encode_cursor(self.last_key) if self.has_next else None
+
+    def cursor_href(self, parameter, cursor):
+        args = dict(get_url_args())
+        args.pop(self.after_parameter, None)
+        args.pop(self.before_parameter, None)
+        args[parameter] = cursor
+        if self.anchor:
+            url = url_for(request.endpoint, _anchor=self.anchor, **args)
+        else:
+            url = url_for(request.endpoint, **args)
+
+        if self.url_coding:
+            return url.decode(self.url_coding) if PY2 else url
+
+        return url
+
+    @property
+    def prev_page(self):
+        if self.has_prev:
+            url = self.cursor_href(self.before_parameter, self.prev_cursor)
+            return self.renderer.prev_page.format(url, self.prev_label)
+
+        return self.renderer.prev_disabled_page.format(self.prev_label)
+
+    @property
+    def next_page(self):
+        if self.has_next:
+            url = self.cursor_href(self.after_parameter, self.next_cursor)
+            return self.renderer.next_page.format(url, self.next_label)
+
+        return self.renderer.next_disabled_page.format(self.next_label)
+
+    def to_dict(self):
+        """Get the cursors and urls without html, e.g. for json responses."""
+        prev_cursor = self.prev_cursor
+        next_cursor = self.next_cursor
+        return dict(
+            has_prev=self.has_prev,
+            has_next=self.has_next,
+            prev_cursor=prev_cursor,
+            next_cursor=next_cursor,
+            prev_url=(
+                self.cursor_href(self.before_parameter, prev_cursor)
+                if self.has_prev
+                else None
+            ),
+            next_url=(
+                self.cursor_href(self.after_parameter, next_cursor)
+                if self.has_next
+                else None
+            ),
+        )
+
+    @property
+    def links(self):
+        """Get the prev/next links."""
+        if not (self.has_prev or self.has_next or self.show_single_page):
+            return ""
+
+        return Markup(self.renderer.wrap(self.prev_page, [], self.next_page))
+
+
+def get_url_adapter(app, server_name=None, script_name=None, url_scheme="http"):
+    """Get a url adapter of the app to build the urls without a request,
+    the defaults are the SERVER_NAME and APPLICATION_ROOT configs."""
+    return app.url_map.bind(
+        server_name or app.config.get("SERVER_NAME") or "localhost",
+        script_name=script_name or app.config.get("APPLICATION_ROOT") or "/",
+        url_scheme=url_scheme,
+    )
+
+
+def _offline_pagination(app, endpoint, total, args, url_adapter, **kwargs):
+    if url_adapter is None:
+        url_adapter = get_url_adapter(app)
+
+    kwargs.setdefault("url_template", True)
+    return Pagination(
+        total=total,
+        app=app,
+        endpoint=endpoint,
+        url_args=dict(args or {}),
+        url_adapter=url_adapter,
+        **kwargs
+    )
+
+
+def iter_page_urls(
+    app, endpoint, total, args=None, first=1, last=None, url_adapter=None, **kwargs
+):
+    """Yield (page, url) of the pages first to last (default is the last
+    page, at least page 1) of endpoint, no request is needed, e.g. for
+    sitemaps::
+
+        for page, url in iter_page_urls(app, "users", total=10**6):
+            ...
+
+    args are the other url values of the pages, the kwargs (per_page,
+    page_parameter, include_first_page_number...) are passed to
+    :class:`Pagination`. The url is built once and the page numbers are
+    substituted, split the range with first/last to share the work.
+    """
+    pagination = _offline_pagination(app, endpoint, total, args, url_adapter, **kwargs)
+    # an empty listing still has its first page
+    total_pages = max(pagination.total_pages, 1)
+    if last is None or last > total_pages:
+        last = total_pages
+
+    for page in range(max(first, 1), last + 1):
+        if page == 1 and not pagination.include_first_page_number:
+            yield page, pagination.page_href(None)
+        else:
+            yield page, pagination.page_href(page)
+
+
+def iter_page_links(
+    app, endpoint, total, args=None, first=1, last=None, url_adapter=None, **kwargs
+):
+    """Yield (page, links) of the pages first to last of endpoint without
+    a request, e.g. to prerender static pages. The kwargs are passed to
+    :class:`Pagination` like :func:`iter_page_urls`.
+    """
+    if url_adapter is None:
+        url_adapter = get_url_adapter(app)
+
+    page_parameter = kwargs.pop("page_parameter", None)
+    if not page_parameter:
+        page_parameter = get_settings(app)["page_parameter"] or "page"
+
+    kwargs["page_parameter"] = page_parameter
+    page = max(first, 1)
+    while last is None or page <= last:
+        kwargs[page_parameter] = page
+        pagination = _offline_pagination(
+            app, endpoint, total, args, url_adapter, **kwargs
+        )
+        yield page, pagination.links
+        if page >= pagination.total_pages:
+            break
+
+        page += 1
+
+
+def paginate_iterable(
+    iterable,
+    length=None,
+    page_parameter=None,
+    per_page_parameter=None,
+    pagination_class=Pagination,
+    **kwargs
+):
+    """Get (items, pagination) of the current page of an iterable without
+    reading more than offset + per_page + 1 items.
+
+    Sequences are sliced. The total of the other iterables is **length**,
+    ``len()`` or ``__length_hint__()``, without them the pagination uses
+    has_more instead of a total. page and per_page are read by
+    :func:`get_page_args`, the other kwargs are passed to the pagination
+    class.
+    """
+    page_name = get_page_parameter(page_parameter)
+    per_page_name = get_per_page_parameter(per_page_parameter)
+    page, per_page, offset = get_page_args(page_name, per_page_name, **kwargs)
+    kwargs.update(
+        {
+            "page_parameter": page_name,
+            "per_page_parameter": per_page_name,
+            page_name: page,
+            per_page_name: per_page,
+        }
+    )
+    if per_page < 1:
+        items = list(iterable)
+        return items, pagination_class(total=len(items), **kwargs)
+
+    if isinstance(iterable, Sequence):
+        items = list(iterable[offset : offset + per_page])
+        return items, pagination_class(total=len(iterable), **kwargs)
+
+    if length is None:
+        length = operator.length_hint(iterable, -1)
+
+    if length >= 0:
+        items = list(islice(iterable, offset, offset + per_page))
+        return items, pagination_class(total=length, **kwargs)
+
+    items = list(islice(iterable, offset, offset + per_page + 1))
+    has_more = len(items) > per_page
+    if has_more:
+        items = items[:per_page]
+
+    kwargs.update(has_more=has_more, page_items=len(items))
+    return items, pagination_class(**kwargs)
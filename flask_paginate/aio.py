@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+flask_paginate.aio
+~~~~~~~~~~~~~~~~~~
+
+Pagination for async views of flask and quart.
+
+:copyright: (c) 2012 by Lix Xu.
+:license: BSD, see LICENSE for more details
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+
+from . import (
+    Pagination,
+    get_page_args,
+    get_page_parameter,
+    get_per_page_parameter,
+    use_quart,
+)
+
+
+async def paginate_async(
+    total,
+    items,
+    page_parameter=None,
+    per_page_parameter=None,
+    pagination_class=Pagination,
+    **kwargs
+):
+    """Get (items, pagination) of the current page, the count and the page
+    are fetched concurrently.
+
+    **total**: an awaitable of the total, or a function returning one
+
+    **items**: an awaitable of the page items, or a function taking
+    (offset, per_page) and returning one
+
+    page and per_page are read by :func:`get_page_args`, the other kwargs
+    are passed to the pagination class. With search=True the total is used
+    as found.
+    """
+    use_quart()
+    page_name = get_page_parameter(page_parameter)
+    per_page_name = get_per_page_parameter(per_page_parameter)
+    page, per_page, offset = get_page_args(page_name, per_page_name, **kwargs)
+    if callable(total):
+        total = total()
+
+    if callable(items):
+        items = items(offset, per_page)
+
+    total, items = await asyncio.gather(total, items)
+    kwargs.update(
+        {
+            "page_parameter": page_name,
+            "per_page_parameter": per_page_name,
+            page_name: page,
+            per_page_name: per_page,
+        }
+    )
+    if kwargs.get("search"):
+        return items, pagination_class(found=total, total=total, **kwargs)
+
+    return items, pagination_class(total=total, **kwargs)
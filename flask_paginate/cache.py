@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+flask_paginate.cache
+~~~~~~~~~~~~~~~~~~~~
+
+Caches the total counts of paginated queries.
+
+A backend stores ``(value, expires)`` entries and has per-key locks::
+
+    get(key)                    # (value, expires) or None
+    set(key, value, expires)
+    acquire(key, blocking=True)  # True if the lock was acquired
+    release(key)
+
+Expired entries are kept so that the other workers can serve the stale
+count while one of them recomputes it.
+
+:copyright: (c) 2012 by Lix Xu.
+:license: BSD, see LICENSE for more details
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_right, insort
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class LRUCountCache(object):
+    """In-process count cache, the least recently used keys are evicted."""
+
+    def __init__(self, max_entries=1024, lock_timeout=10):
+        self.max_entries = max_entries
+        self.lock_timeout = lock_timeout
+        self._entries = OrderedDict()
+        self._mutex = threading.Lock()
+        self._locks = {}
+
+    def get(self, key):
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def set(self, key, value, expires):
+        with self._mutex:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                old_key = self._entries.popitem(last=False)[0]
+                lock = self._locks.get(old_key)
+                if lock is not None and not lock.locked():
+                    del self._locks[old_key]
+
+    def acquire(self, key, blocking=True):
+        with self._mutex:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        if blocking:
+            return lock.acquire(True, self.lock_timeout)
+
+        return lock.acquire(False)
+
+    def release(self, key):
+        with self._mutex:
+            lock = self._locks.get(key)
+
+        if lock is not None:
+            lock.release()
+
+    def clear(self):
+        with self._mutex:
+            self._entries.clear()
+            for key, lock in list(self._locks.items()):
+                if not lock.locked():
+                    del self._locks[key]
+
+
+class SharedMemoryCountCache(object):
+    """Count cache shared by the processes (e.g. gunicorn workers) of one
+    host, every key is a small json file in a tmpfs directory and the locks
+    are ``flock`` locks.
+
+    Every sweep_every sets, the files older than max_age seconds are
+    removed, then the oldest ones above max_entries.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        max_entries=10000,
+        max_age=3600,
+        lock_timeout=10,
+        sweep_every=100,
+    ):
+        if fcntl is None:
+            raise RuntimeError("SharedMemoryCountCache requires fcntl")
+
+        if path is None:
+            base = "/dev/shm"
+            if not os.path.isdir(base):
+                base = tempfile.gettempdir()
+
+            path = os.path.join(base, "flask-paginate-{0}".format(os.getuid()))
+
+        self.path = path
+        if not os.path.isdir(path):
+            os.makedirs(path, 0o700)
+
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.lock_timeout = lock_timeout
+        self.sweep_every = sweep_every
+        self._sets = 0
+        self._locks = {}
+
+    def _file(self, key):
+        digest = hashlib.sha1("{0!r}".format(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, digest)
+
+    def get(self, key):
+        try:
+            with open(self._file(key)) as f:
+                value, expires = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        return value, expires
+
+    def set(self, key, value, expires):
+        filename = self._file(key)
+        fd, tmp = tempfile.mkstemp(dir=self.path)
+        with os.fdopen(fd, "w") as f:
+            json.dump([value, expires], f)
+
+        os.rename(tmp, filename)
+        self._sets += 1
+        if self._sets % self.sweep_every == 0:
+            self.sweep()
+
+    def sweep(self):
+        """Remove the old entries and lock files."""
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.path):
+            filename = os.path.join(self.path, name)
+            try:
+                mtime = os.stat(filename).st_mtime
+                if now - mtime > self.max_age:
+                    os.remove(filename)
+                elif not name.endswith(".lock") and not name.startswith("tmp"):
+                    entries.append((mtime, filename))
+            except OSError:
+                # removed by another process
+                continue
+
+        entries.sort()
+        for _, filename in entries[: max(len(entries) - self.max_entries, 0)]:
+            for name in (filename, filename + ".lock"):
+                try:
+                    os.remove(name)
+                except OSError:
+                    pass
+
+    def acquire(self, key, blocking=True):
+        fd = os.open(self._file(key) + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        deadline = time.time() + self.lock_timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except (IOError, OSError):
+                if not blocking or time.time() >= deadline:
+                    os.close(fd)
+                    return False
+
+                time.sleep(0.01)
+
+        self._locks[key] = fd
+        return True
+
+    def release(self, key):
+        fd = self._locks.pop(key, None)
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def clear(self):
+        for name in os.listdir(self.path):
+            if not name.endswith(".lock"):
+                os.remove(os.path.join(self.path, name))
+
+
+default_cache = LRUCountCache()
+
+
+def cached_total(key, compute, ttl=60, cache=None):
+    """Get the count of key from the cache, call compute() when it is
+    missing or expired.
+
+    Only one caller recomputes an expired count, the others get the stale
+    one meanwhile (or wait when there is nothing cached yet).
+    """
+    if cache is None:
+        cache = default_cache
+
+    entry = cache.get(key)
+    if entry is not None and entry[1] > time.time():
+        return entry[0]
+
+    if not cache.acquire(key, blocking=entry is None):
+        if entry is not None:
+            return entry[0]
+
+        return compute()
+
+    try:
+        # another caller may have finished while we were waiting
+        fresh = cache.get(key)
+        if fresh is not None and fresh[1] > time.time():
+            return fresh[0]
+
+        value = compute()
+        cache.set(key, value, time.time() + ttl)
+        return value
+    finally:
+        cache.release(key)
+
+
+class FragmentCache(object):
+    """LRU cache of rendered pagination html, ``hits`` and ``misses`` count
+    the lookups to help sizing it."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+        self._mutex = threading.Lock()
+
+    def get(self, key):
+        with self._mutex:
+            html = self._entries.get(key)
+            if html is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+            return html
+
+    def set(self, key, html):
+        with self._mutex:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._mutex:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+class BoundaryIndex(object):
+    """Sort keys of the rows before known offsets, per query fingerprint.
+
+    A page starting at a known offset (or after one) becomes a seek from
+    the key instead of an offset scan. The total of the query is kept with
+    the keys, a different total means rows were inserted or deleted and
+    drops them. At most max_queries fingerprints (least recently used) and
+    max_offsets offsets per fingerprint (the oldest) are kept.
+    """
+
+    def __init__(self, max_queries=256, max_offsets=1024):
+        self.max_queries = max_queries
+        self.max_offsets = max_offsets
+        # fingerprint: (total, sorted offsets, {offset: key})
+        self._entries = OrderedDict()
+        self._mutex = threading.Lock()
+
+    def _get(self, fingerprint, total):
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            return None
+
+        if entry[0] != total:
+            # stale keys
+            del self._entries[fingerprint]
+            return None
+
+        self._entries.move_to_end(fingerprint)
+        return entry
+
+    def nearest(self, fingerprint, offset, total=None):
+        """Get (known offset, key) of the largest known offset up to
+        offset, (0, None) when there is none or the total changed."""
+        with self._mutex:
+            entry = self._get(fingerprint, total)
+            if entry is None:
+                return 0, None
+
+            offsets, keys = entry[1:]
+            i = bisect_right(offsets, offset)
+            if not i:
+                return 0, None
+
+            return offsets[i - 1], keys[offsets[i - 1]]
+
+    def add(self, fingerprint, offset, key, total=None):
+        """Record the key of the row before offset, when the query had
+        total rows."""
+        with self._mutex:
+            entry = self._get(fingerprint, total)
+            if entry is None:
+                entry = self._entries[fingerprint] = (total, [], OrderedDict())
+                while len(self._entries) > self.max_queries:
+                    self._entries.popitem(last=False)
+
+            offsets, keys = entry[1:]
+            if offset not in keys:
+                insort(offsets, offset)
+
+            keys[offset] = key
+            while len(keys) > self.max_offsets:
+                offsets.remove(keys.popitem(last=False)[0])
+
+    def clear(self, fingerprint=None):
+        """Forget the keys of a fingerprint or of all of them."""
+        with self._mutex:
+            if fingerprint is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(fingerprint, None)
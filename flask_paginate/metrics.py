@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+flask_paginate.metrics
+~~~~~~~~~~~~~~~~~~~~~~
+
+Per-endpoint histograms of the requested pages, exported in the
+Prometheus text format.
+
+:copyright: (c) 2012 by Lix Xu.
+:license: BSD, see LICENSE for more details
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from bisect import bisect_left
+
+from flask import Response, abort, request
+
+from . import page_args_parsed, pagination_created
+
+BUCKETS = (
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+    5000,
+    10000,
+    100000,
+    1000000,
+)
+
+HISTOGRAMS = (
+    ("page", "Requested page number."),
+    ("per_page", "Requested records per page."),
+    ("offset", "Computed offset of the requested page."),
+    ("total_pages", "Total pages of the paginations."),
+)
+
+OTHER_ENDPOINT = "_other"
+LOCAL_ADDRS = ("127.0.0.1", "::1")
+
+
+def local_only():
+    """Allow the requests from the host itself. A request forwarded by a
+    proxy comes from the host too, so any forwarding header refuses it."""
+    if request.headers.get("X-Forwarded-For") or request.headers.get("Forwarded"):
+        return False
+
+    return request.remote_addr in LOCAL_ADDRS
+
+
+def _escape(value):
+    value = "{0}".format(value)
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PaginationMetrics(object):
+    """Collects page, per_page, offset (from :func:`get_page_args`) and
+    total_pages (from :class:`Pagination`) of every endpoint::
+
+        metrics = PaginationMetrics(app, url="/metrics/pagination")
+
+    The histograms have fixed buckets and at most max_endpoints endpoints
+    (the others are counted as ``_other``), so the memory is bounded.
+    They are updated without locks, concurrent threads may rarely lose
+    an observation.
+
+    access is called by the view and returns whether the request may
+    read the metrics, the default :func:`local_only` refuses the requests
+    forwarded by a proxy.
+    """
+
+    def __init__(
+        self,
+        app=None,
+        url=None,
+        buckets=BUCKETS,
+        max_endpoints=200,
+        access=local_only,
+    ):
+        self.buckets = tuple(buckets)
+        self.max_endpoints = max_endpoints
+        self.access = access
+        # name: {endpoint: [bucket counts..., +Inf count, sum]}
+        self.histograms = dict((name, {}) for name, _ in HISTOGRAMS)
+        if app is not None:
+            self.init_app(app, url)
+
+    def init_app(self, app, url=None):
+        page_args_parsed.connect(self._page_args_parsed, app, weak=False)
+        pagination_created.connect(self._pagination_created, app, weak=False)
+        if url:
+            app.add_url_rule(url, "pagination_metrics", self.view)
+
+    def observe(self, name, endpoint, value):
+        histogram = self.histograms[name]
+        counts = histogram.get(endpoint)
+        if counts is None:
+            if len(histogram) >= self.max_endpoints:
+                endpoint = OTHER_ENDPOINT
+
+            counts = histogram.setdefault(endpoint, [0] * (len(self.buckets) + 2))
+
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def _page_args_parsed(self, sender, page, per_page, offset, **kwargs):
+        endpoint = request.endpoint
+        self.observe("page", endpoint, page)
+        self.observe("per_page", endpoint, per_page)
+        self.observe("offset", endpoint, offset)
+
+    def _pagination_created(self, sender, pagination, total_pages, **kwargs):
+        self.observe("total_pages", pagination.endpoint, total_pages)
+
+    def render(self):
+        """Get the histograms in the Prometheus text format."""
+        lines = []
+        for name, doc in HISTOGRAMS:
+            metric = "flask_paginate_{0}".format(name)
+            lines.append("# HELP {0} {1}".format(metric, doc))
+            lines.append("# TYPE {0} histogram".format(metric))
+            for endpoint, counts in sorted(
+                self.histograms[name].items(), key=lambda item: "{0}".format(item[0])
+            ):
+                label = 'endpoint="{0}"'.format(_escape(endpoint))
+                total = 0
+                for le, count in zip(self.buckets + ("+Inf",), counts):
+                    total += count
+                    lines.append(
+                        '{0}_bucket{{{1},le="{2}"}} {3}'.format(
+                            metric, label, le, total
+                        )
+                    )
+
+                lines.append("{0}_sum{{{1}}} {2}".format(metric, label, counts[-1]))
+                lines.append("{0}_count{{{1}}} {2}".format(metric, label, total))
+
+        lines.append("")
+        return "\n".join(lines)
+
+    def view(self):
+        if not self.access():
+            abort(403)
+
+        return Response(self.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+flask_paginate.pool
+~~~~~~~~~~~~~~~~~~~
+
+Fetches the count and the page concurrently in a thread pool.
+
+:copyright: (c) 2012 by Lix Xu.
+:license: BSD, see LICENSE for more details
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import (
+    Pagination,
+    current_app,
+    get_page_args,
+    get_page_parameter,
+    get_per_page_parameter,
+    get_settings,
+)
+
+_lock = threading.Lock()
+
+
+def get_executor(app=None):
+    """Get the thread pool of the app, None when PAGINATION_FETCH_WORKERS
+    is not set. The pool is created on first use and shared by the
+    requests, so the concurrent queries are bounded."""
+    if app is None:
+        app = current_app._get_current_object()
+
+    executor = app.extensions.get("paginate_executor")
+    if executor is not None:
+        return executor
+
+    workers = int(get_settings(app)["fetch_workers"] or 0)
+    if workers < 1:
+        return None
+
+    with _lock:
+        executor = app.extensions.get("paginate_executor")
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                workers, thread_name_prefix="flask-paginate"
+            )
+            app.extensions["paginate_executor"] = executor
+
+    return executor
+
+
+def _in_app_context(app, func, *args):
+    # a new app context per call, so app-scoped sessions are not shared
+    with app.app_context():
+        return func(*args)
+
+
+def fetch_page(
+    count_fn,
+    rows_fn,
+    page_parameter=None,
+    per_page_parameter=None,
+    timeout=None,
+    executor=None,
+    pagination_class=Pagination,
+    **kwargs
+):
+    """Get (rows, pagination) of the current page, count_fn() and
+    rows_fn(offset, per_page) run concurrently in the thread pool::
+
+        rows, pagination = fetch_page(
+            lambda: count_users(get_connection()),
+            lambda offset, per_page: fetch_users(get_connection(), offset, per_page),
+        )
+
+    The functions run in a new app context of their own (without the
+    request), they should use their own database connections. The first
+    exception of the functions is raised, and a
+    ``concurrent.futures.TimeoutError`` after **timeout** seconds
+    (default is PAGINATION_FETCH_TIMEOUT). Without an executor (default
+    is :func:`get_executor`) they run one after the other.
+
+    page and per_page are read by :func:`get_page_args`, the other kwargs
+    are passed to the pagination class. With search=True the total is used
+    as found.
+    """
+    page_name = get_page_parameter(page_parameter)
+    per_page_name = get_per_page_parameter(per_page_parameter)
+    page, per_page, offset = get_page_args(page_name, per_page_name, **kwargs)
+    app = current_app._get_current_object()
+    if executor is None:
+        executor = get_executor(app)
+
+    if executor is None:
+        total = count_fn()
+        rows = rows_fn(offset, per_page)
+    else:
+        if timeout is None:
+            timeout = get_settings(app)["fetch_timeout"]
+
+        futures = [
+            executor.submit(_in_app_context, app, count_fn),
+            executor.submit(_in_app_context, app, rows_fn, offset, per_page),
+        ]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            results = []
+            for future in futures:
+                remaining = None
+                if deadline is not None:
+                    remaining = max(deadline - time.monotonic(), 0)
+
+                results.append(future.result(remaining))
+        finally:
+            for future in futures:
+                future.cancel()
+
+        total, rows = results
+
+    kwargs.update(
+        {
+            "page_parameter": page_name,
+            "per_page_parameter": per_page_name,
+            page_name: page,
+            per_page_name: per_page,
+        }
+    )
+    if kwargs.get("search"):
+        return rows, pagination_class(found=total, total=total, **kwargs)
+
+    return rows, pagination_class(total=total, **kwargs)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+flask_paginate.sqla
+~~~~~~~~~~~~~~~~~~~
+
+Paginates SQLAlchemy select statements (requires SQLAlchemy 1.4+).
+
+:copyright: (c) 2012 by Lix Xu.
+:license: BSD, see LICENSE for more details
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+
+from sqlalchemy import func, select
+
+from . import (
+    BoundaryIndex,
+    Pagination,
+    get_page_args,
+    get_page_parameter,
+    get_per_page_parameter,
+)
+
+STRATEGIES = ("window", "count", "probe", "deferred_join", "seek")
+
+default_boundaries = BoundaryIndex()
+
+
+def count_query(stmt):
+    """Get the ``count(*)`` statement of a select."""
+    subquery = stmt.order_by(None).limit(None).offset(None).subquery()
+    return select(func.count()).select_from(subquery)
+
+
+def query_fingerprint(stmt):
+    """Get a hash of the sql and the parameters of a statement."""
+    compiled = stmt.compile()
+    key = repr((str(compiled), sorted(compiled.params.items())))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def supports_window(dialect):
+    """Whether the database supports ``count(*) over ()``: SQLite 3.25+,
+    MySQL 8+, MariaDB 10.2+ and the other databases."""
+    if dialect.name == "sqlite":
+        version = getattr(dialect.dbapi, "sqlite_version_info", None)
+        return version is None or tuple(version) >= (3, 25)
+
+    if dialect.name in ("mysql", "mariadb"):
+        version = dialect.server_version_info
+        if not version:
+            return False
+
+        if getattr(dialect, "is_mariadb", False):
+            return tuple(version) >= (10, 2)
+
+        return tuple(version) >= (8,)
+
+    return True
+
+
+def _counts_over(session, stmt):
+    """Whether ``count(*) over ()`` added to stmt counts its rows, it is
+    computed before DISTINCT."""
+    if getattr(stmt, "_distinct", False) or getattr(stmt, "_distinct_on", ()):
+        return False
+
+    return supports_window(session.get_bind(clause=stmt).dialect)
+
+
+def _limit(stmt, per_page, offset, extra=0):
+    if per_page < 1:
+        return stmt
+
+    return stmt.limit(per_page + extra).offset(offset)
+
+
+def _rows(rows, single, strip=0):
+    if single:
+        return [row[0] for row in rows]
+
+    if strip:
+        return [tuple(row[:-strip]) for row in rows]
+
+    return rows
+
+
+def paginate_query(
+    session,
+    stmt,
+    strategy="window",
+    key=None,
+    page_parameter=None,
+    per_page_parameter=None,
+    boundaries=None,
+    descending=False,
+    pagination_class=Pagination,
+    **kwargs
+):
+    """Get (rows, pagination) of the current page of a select statement.
+
+    page and per_page are read by :func:`get_page_args`, the other kwargs
+    are passed to **pagination_class** (default is :class:`Pagination`).
+    Rows of a single entity/column select are the entities/values,
+    otherwise tuples.
+
+    **strategy**:
+
+        **window**: fetch the page and ``count(*) over ()`` in one query,
+        the count query is only run for a page past the end. DISTINCT
+        statements and databases without window functions use **count**
+
+        **count**: run a separate count query
+
+        **probe**: fetch per_page + 1 rows instead of counting, the
+        pagination has no last page
+
+        **deferred_join**: fetch the **key** column (e.g. the primary key)
+        of the page with the count first, then the rows of these keys,
+        the offset scan only reads the key index, it falls back to
+        **count** like **window**
+
+        **seek**: the statement is ordered by the unique **key** column
+        (**descending** or not), the key of the last row of every fetched
+        page is kept in **boundaries** (default is a shared
+        :class:`BoundaryIndex`) and a page after a known one is fetched
+        with ``WHERE key > boundary`` and a smaller offset, the total is
+        counted by a separate query and a new total drops the keys
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError("unknown strategy: {0}".format(strategy))
+
+    page_name = get_page_parameter(page_parameter)
+    per_page_name = get_per_page_parameter(per_page_parameter)
+    page, per_page, offset = get_page_args(page_name, per_page_name, **kwargs)
+    kwargs.update(
+        {
+            "page_parameter": page_name,
+            "per_page_parameter": per_page_name,
+            page_name: page,
+            per_page_name: per_page,
+        }
+    )
+    single = len(stmt.column_descriptions) == 1
+    if strategy in ("window", "deferred_join") and not _counts_over(session, stmt):
+        strategy = "count"
+
+    if strategy == "count":
+        total = session.execute(count_query(stmt)).scalar()
+        rows = session.execute(_limit(stmt, per_page, offset)).all()
+        return _rows(rows, single), pagination_class(total=total, **kwargs)
+
+    if strategy == "probe":
+        rows = session.execute(_limit(stmt, per_page, offset, 1)).all()
+        has_more = 0 < per_page < len(rows)
+        if has_more:
+            rows = rows[:per_page]
+
+        kwargs.update(has_more=has_more, page_items=len(rows))
+        return _rows(rows, single), pagination_class(**kwargs)
+
+    if strategy == "seek":
+        if key is None:
+            raise ValueError("seek requires the key column")
+
+        if boundaries is None:
+            boundaries = default_boundaries
+
+        total = session.execute(count_query(stmt)).scalar()
+        fingerprint = query_fingerprint(stmt)
+        known, boundary = boundaries.nearest(fingerprint, offset, total)
+        page_stmt = stmt.add_columns(key.label("_key"))
+        if boundary is not None:
+            page_stmt = page_stmt.where(
+                key < boundary if descending else key > boundary
+            )
+
+        rows = session.execute(_limit(page_stmt, per_page, offset - known)).all()
+        if rows and per_page > 0:
+            boundaries.add(fingerprint, offset + len(rows), rows[-1][-1], total)
+
+        return _rows(rows, single, 1), pagination_class(total=total, **kwargs)
+
+    total_column = func.count().over().label("_total")
+    if strategy == "deferred_join":
+        if key is None:
+            raise ValueError("deferred_join requires the key column")
+
+        key_stmt = stmt.with_only_columns(key, total_column)
+        keys = session.execute(_limit(key_stmt, per_page, offset)).all()
+        total = keys[0][-1] if keys else None
+        rows = []
+        if keys:
+            page_stmt = stmt.where(key.in_([row[0] for row in keys]))
+            rows = _rows(session.execute(page_stmt).all(), single)
+    else:
+        page_stmt = stmt.add_columns(total_column)
+        rows = session.execute(_limit(page_stmt, per_page, offset)).all()
+        total = rows[0][-1] if rows else None
+        rows = _rows(rows, single, 1)
+
+    if total is None:
+        total = session.execute(count_query(stmt)).scalar() if page > 1 else 0
+
+    return rows, pagination_class(total=total, **kwargs)
@@ -1,6 +1,15 @@
 """Tests for flask-paginate."""
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 
+import flask
+import flask_paginate
 import pytest
 from flask import Flask
 from flask_paginate import (
@@ -9,6 +18,13 @@ from flask_paginate import (
     CSS_LINKS_END,
     CURRENT_PAGES,
     DISPLAY_MSG,
+    BoundaryIndex,
+    CursorPagination,
+    FragmentCache,
+    LINKS,
+    LRUCountCache,
+    SharedMemoryCountCache,
+    LazyPagination,
     GAP_MARKERS,
     NEXT_DISABLED_PAGES,
     NEXT_LABEL,
@@ -17,9 +33,31 @@ from flask_paginate import (
     PREV_LABEL,
     PREV_PAGES,
     RECORD_NAME,
+    RESOURCE_HINTS,
     SEARCH_MSG,
+    TEMPLATES,
+    Paginate,
     Pagination,
-    get_page_args
+    cached_total,
+    check_page_args,
+    decode_cursor,
+    encode_cursor,
+    get_count_id,
+    get_cursor_args,
+    get_page_args,
+    get_page_etag,
+    get_renderer,
+    get_request_args,
+    iter_page_links,
+    iter_page_urls,
+    links_rendered,
+    normalize_page_args,
+    not_modified,
+    paginate_iterable,
+    page_args_parsed,
+    pagination_created,
+    register_css_framework,
+    set_pagination_headers
     )
 
 
@@ -66,6 +104,26 @@ class TestGetPageArgs(FlaskTestMixin):
             assert per_page_param == "pp"
 
 
+    def test_get_page_args_kwargs_default(self):
+        with self.app.test_request_context("/?page=3"):
+            assert get_page_args(per_page=20) == (3, 20, 40)
+            assert get_page_args(page=5) == (3, 10, 20)
+
+    def test_request_args_parsed_once(self):
+        with self.app.test_request_context("/?page=2&q=a&q=b"):
+            args = get_request_args()
+            assert get_request_args() is args
+            assert args.getlist("q") == ["a", "b"]
+            with pytest.raises(TypeError):
+                args["page"] = 1
+
+            get_page_args(per_page=5)
+            pagination = Pagination(page=2)
+            pagination.page_href(3)
+            assert get_request_args() is args
+            assert args["page"] == "2"
+
+
 class TestPagination(FlaskTestMixin):
     """Tests for the Pagination class."""
 
@@ -159,3 +217,1041 @@ class TestPagination(FlaskTestMixin):
             pagination = Pagination(per_page_parameter="pp")
             assert pagination.page_parameter == "page"
             assert pagination.per_page_parameter == "pp"
+
+    def test_renderer_is_shared(self):
+        with self.app.test_request_context("/"):
+            p1 = Pagination(css_framework="bulma", link_size="small")
+            p2 = Pagination(css_framework="bulma", link_size="small")
+            assert p1.renderer is p2.renderer
+            assert p1.link_size == " is-small"
+            with pytest.raises(AttributeError):
+                p1.renderer.link = ""
+
+    def test_register_css_framework(self):
+        try:
+            register_css_framework(
+                "custom",
+                link='<a href="{0}">{1}</a>',
+                current_page="<b>{0}</b>",
+                gap_marker="<i>...</i>",
+                prev_page='<a href="{0}"{2}>{1}</a>',
+                next_page='<a href="{0}"{2}>{1}</a>',
+                prev_disabled_page="<s>{0}</s>",
+                next_disabled_page="<s>{0}</s>",
+                css_links='<nav class="{0}{1}">',
+                css_links_end="</nav>",
+            )
+            assert get_renderer("custom").css_framework == "custom"
+            with self.app.test_request_context("/"):
+                pagination = Pagination(
+                    total=30, css_framework="custom", next_rel="next"
+                )
+                assert pagination.links == (
+                    '<nav class=""><s>&laquo;</s><b>1</b>'
+                    '<a href="/?page=2">2</a><a href="/?page=3">3</a>'
+                    '<a href="/?page=2" rel="next">&raquo;</a></nav>'
+                )
+        finally:
+            for templates in list(TEMPLATES.values()) + [LINKS, RESOURCE_HINTS]:
+                templates.pop("custom", None)
+
+            flask_paginate._renderers.clear()
+
+    def test_template_overrides(self):
+        """The raw templates can be replaced per pagination or subclass."""
+
+        class BoldPagination(Pagination):
+            current_page_fmt = "<b>{0}</b>"
+
+        with self.app.test_request_context("/"):
+            pagination = Pagination(total=30)
+            pagination.link = '<a href="{0}">{1}</a>'
+            assert '<a href="/?page=2">2</a>' in pagination.links
+            assert Pagination(total=30).link == BS4_LINK
+            assert pagination.renderer == Pagination(total=30).renderer.replace(
+                link='<a href="{0}">{1}</a>'
+            )
+            assert "<b>1</b>" in BoldPagination(total=30).links
+            assert "<b>1</b>" not in Pagination(total=30).links
+
+    def test_paginate_settings_snapshot(self):
+        self.app.config["PAGINATION_INNER_WINDOW"] = 3
+        ext = Paginate(self.app)
+        self.app.config["PAGINATION_INNER_WINDOW"] = 4
+        with self.app.test_request_context("/"):
+            assert Pagination().inner_window == 3
+            assert Pagination(inner_window=5).inner_window == 5
+            settings = self.app.extensions["paginate"]
+            with pytest.raises(TypeError):
+                settings["inner_window"] = 1
+
+            with pytest.raises(TypeError):
+                dict.__setitem__(settings, "inner_window", 1)
+
+            with pytest.raises(TypeError):
+                settings |= {"inner_window": 1}
+
+            assert Pagination().inner_window == 3
+
+            ext.refresh()
+            assert Pagination().inner_window == 4
+
+    def test_url_template(self):
+        def users(page):
+            return "users"
+
+        self.app.add_url_rule("/users", "users", users, defaults={"page": 1})
+        self.app.add_url_rule("/users/page/<int:page>", "users", users)
+        for url in ("/?q=a&q=b&page=5", "/users/page/5?q=a&q=b"):
+            with self.app.test_request_context(url):
+                self.app.preprocess_request()
+                kwargs = dict(total=200, page=5, anchor="top")
+                expected = Pagination(**kwargs).links
+                pagination = Pagination(url_template=True, **kwargs)
+                assert pagination.links == expected
+                assert pagination._url_parts[1]
+
+    def test_url_template_converter(self):
+        """A converter formatting the page falls back to url_for."""
+        self.app.add_url_rule(
+            "/f/<int(fixed_digits=4):page>", "fixed", lambda page: ""
+        )
+        with self.app.test_request_context("/f/0005"):
+            pagination = Pagination(
+                total=200,
+                page=5,
+                url_template=True,
+                include_first_page_number=True,
+            )
+            assert '/f/0004"' in pagination.links
+            assert '/f/4"' not in pagination.links
+            assert not pagination._url_parts[1]
+            assert pagination.to_dict()["next_url"] == "/f/0006"
+
+        urls = list(
+            iter_page_urls(
+                self.app,
+                "fixed",
+                total=30,
+                per_page=10,
+                include_first_page_number=True,
+            )
+        )
+        assert urls == [(1, "/f/0001"), (2, "/f/0002"), (3, "/f/0003")]
+
+    def test_lazy_pagination(self):
+        with self.app.test_request_context("/?q=a"):
+            pagination = LazyPagination(total=100, page=2)
+            assert not hasattr(pagination, "__dict__")
+            assert pagination._args is None
+            assert pagination.total_pages == 10
+            assert pagination.links is pagination.links
+            assert pagination.pages is pagination.pages
+            assert pagination.info is pagination.info
+            assert pagination.args["q"] == "a"
+            assert pagination.links == Pagination(total=100, page=2).links
+
+    def test_has_more(self):
+        with self.app.test_request_context("/"):
+            pagination = Pagination(page=8, has_more=True)
+            assert pagination.total_pages == 9
+            assert pagination.has_next
+            assert pagination.pages == [1, 2, None, 5, 6, 7, 8, 9]
+            assert "page=10" not in pagination.links
+            assert "page=9" in pagination.next_page
+            assert pagination.info == (
+                '<div class="pagination-page-info">'
+                "displaying <b>71 - 80</b> records</div>"
+            )
+
+            pagination = Pagination(page=5, has_more=False, page_items=3)
+            assert pagination.total_pages == 5
+            assert not pagination.has_next
+            assert "41 - 43" in pagination.info
+
+            pagination = Pagination(page=2, has_more=False, page_items=0)
+            assert pagination.get_start_end() == (0, 0)
+            assert "<b>0 - 0</b>" in pagination.info
+
+    def test_found_is_lower_bound(self):
+        with self.app.test_request_context("/"):
+            pagination = Pagination(
+                search=True,
+                found=10001,
+                total_cap=10000,
+                format_total=True,
+                page=5,
+            )
+            assert pagination.found == 10000
+            assert pagination.found_is_lower_bound
+            assert pagination.pages == [1, 2, None, 3, 4, 5, 6, 7, None]
+            assert "page=1000" not in pagination.links
+            assert "found <b>10,000+</b> records" in pagination.info
+
+            pagination = Pagination(
+                total=100, found_is_lower_bound=True, page=10
+            )
+            assert pagination.has_next
+            assert pagination.pages == [1, 2, None, 6, 7, 8, 9, 10, None]
+            assert "total <b>100+</b>" in pagination.info
+
+            pagination = Pagination(total=10001, total_cap=10000, page=1005)
+            assert pagination.total_pages == 1005
+            assert pagination.pages == [1, 2, None, 1001, 1002, 1003, 1004, 1005, None]
+            assert "page=1004" in pagination.prev_page
+            assert "page=1006" in pagination.next_page
+
+            pagination = Pagination(
+                total=10001, total_cap=10000, per_page=0, show_single_page=True
+            )
+            assert list(pagination.pages) == [1]
+
+    def test_callable_total(self):
+        calls = []
+
+        def count(calls=calls):
+            calls.append(1)
+            return 42
+
+        cache = LRUCountCache()
+        for url in ("/?q=a", "/?q=a&page=2", "/?q=b"):
+            with self.app.test_request_context(url):
+                pagination = Pagination(total=count, count_cache=cache)
+                assert pagination.total == 42
+
+        assert len(calls) == 2
+
+    def test_callable_totals_are_not_shared(self):
+        """Count functions and apps have their own cache entries."""
+        with self.app.test_request_context("/?q=a"):
+            assert Pagination(total=lambda: 500).total == 500
+            assert Pagination(total=lambda: 7).total == 7
+
+        other = Flask(__name__)
+        other.add_url_rule("/", "test_route", lambda: "")
+        with other.test_request_context("/?q=a"):
+            assert Pagination(total=lambda: 500).total == 500
+            assert Pagination(total=lambda: 7, total_ttl=0).total == 7
+
+    def test_callable_totals_of_closures(self):
+        """Closures and partials of one function have their own counts,
+        closures over other objects are only cached with a total_key."""
+        import functools
+
+        def counter(n):
+            return lambda: n
+
+        def count(n):
+            return n
+
+        with self.app.test_request_context("/?q=a"):
+            assert Pagination(total=counter(500)).total == 500
+            assert Pagination(total=counter(7)).total == 7
+            assert Pagination(total=functools.partial(count, 40)).total == 40
+            assert Pagination(total=functools.partial(count, 3)).total == 3
+            assert get_count_id(counter(7)) == get_count_id(counter(7))
+            counts = [0, 35]
+            assert Pagination(total=lambda: counts.pop()).total == 35
+            assert Pagination(total=lambda: counts.pop()).total == 0
+            counts = [0, 35]
+
+            def pop():
+                return counts.pop()
+
+            assert Pagination(total=pop, total_key="a").total == 35
+            assert Pagination(total=pop, total_key="a").total == 35
+
+    def test_fragment_cache(self):
+        cache = FragmentCache(max_entries=10)
+        with self.app.test_request_context("/?q=a&page=2"):
+            links = Pagination(total=100, page=2, fragment_cache=cache).links
+            assert (cache.hits, cache.misses) == (0, 1)
+
+        with self.app.test_request_context("/?page=2&q=a"):
+            pagination = Pagination(total=100, page=2, fragment_cache=cache)
+            assert pagination.links is links
+            assert (cache.hits, cache.misses) == (1, 1)
+            pagination.info
+            pagination.info
+            assert (cache.hits, cache.misses) == (2, 2)
+
+        with self.app.test_request_context("/?q=b&page=2"):
+            pagination = Pagination(total=100, page=2, fragment_cache=cache)
+            assert "q=b" in pagination.links
+            assert (cache.hits, cache.misses) == (2, 3)
+
+    def test_fragment_cache_url_defaults(self):
+        """Values added by url_defaults are part of the cache key."""
+        app = Flask(__name__)
+
+        @app.url_defaults
+        def add_language(endpoint, values):
+            values.setdefault("lang", flask.g.lang)
+
+        @app.url_value_preprocessor
+        def pull_language(endpoint, values):
+            flask.g.lang = values.pop("lang")
+
+        app.add_url_rule("/<lang>/users", "users", lambda: "")
+        cache = FragmentCache(max_entries=10)
+        for lang in ("en", "de"):
+            url = "/{0}/users?page=2".format(lang)
+            with app.test_request_context(url):
+                app.preprocess_request()
+                pagination = Pagination(total=100, page=2, fragment_cache=cache)
+                assert "/{0}/users?page=3".format(lang) in pagination.links
+
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_signals(self):
+        events = []
+
+        def record(sender, **kwargs):
+            events.append(kwargs)
+
+        with self.app.test_request_context("/"):
+            with pagination_created.connected_to(record, self.app):
+                with links_rendered.connected_to(record, self.app):
+                    pagination = Pagination(total=100, page=5)
+                    pagination.links
+
+        created, rendered = events
+        assert created["pagination"] is pagination
+        assert created["urls_built"] == 0
+        assert rendered["css_framework"] == "bootstrap4"
+        assert rendered["page"] == 5
+        assert rendered["per_page"] == 10
+        assert rendered["total_pages"] == 10
+        assert rendered["urls_built"] == 10
+        assert rendered["elapsed_ns"] > 0
+
+    def test_to_dict(self):
+        with self.app.test_request_context("/?q=a"):
+            data = Pagination(total=95, page=5).to_dict()
+            json.dumps(data)
+            assert data["offset"] == 40
+            assert (data["start"], data["end"]) == (41, 50)
+            assert data["total_pages"] == 10
+            assert data["prev_url"] == "/?q=a&page=4"
+            assert data["next_url"] == "/?q=a&page=6"
+            assert data["first_url"] == "/?q=a"
+            assert data["last_url"] == "/?q=a&page=10"
+            assert data["pages"][0] == dict(page=1, url="/?q=a", current=False)
+            assert [p for p in data["pages"] if p and p["current"]] == [
+                dict(page=5, url="/?q=a&page=5", current=True)
+            ]
+            assert None in data["pages"]
+
+            data = Pagination(page=3, has_more=True).to_dict()
+            assert data["last_url"] is None
+            assert data["next_url"] == "/?q=a&page=4"
+
+    def test_link_header(self):
+        with self.app.test_request_context("/?q=a&page=2"):
+            pagination = Pagination(total=95, page=2)
+            assert pagination.get_link_header() == (
+                '</?q=a>; rel="first", </?q=a>; rel="prev", '
+                '</?q=a&page=3>; rel="next", </?q=a&page=10>; rel="last"'
+            )
+            response = self.app.make_response("")
+            response.headers["Link"] = '</style.css>; rel="preload"'
+            set_pagination_headers(response, pagination, etag="abc")
+            assert response.headers["Link"].startswith(
+                '</style.css>; rel="preload", </?q=a>; rel="first"'
+            )
+            assert response.headers["ETag"] == 'W/"abc"'
+
+    def test_not_modified(self):
+        events = []
+
+        def record(sender, **kwargs):
+            events.append(kwargs)
+
+        with self.app.test_request_context("/?page=2"):
+            with page_args_parsed.connected_to(record, self.app):
+                etag = get_page_etag(95)
+
+            assert events == []
+            assert etag != get_page_etag(96)
+            assert etag != get_page_etag(95, version=2)
+            assert not_modified(etag) is None
+
+        headers = {"If-None-Match": 'W/"{0}"'.format(etag)}
+        with self.app.test_request_context("/?page=2", headers=headers):
+            assert not_modified(etag).status_code == 304
+
+        with self.app.test_request_context("/?page=3", headers=headers):
+            assert not_modified(get_page_etag(95)) is None
+
+    def test_offline_urls(self):
+        """The urls are built without a request like in the request."""
+        self.app.add_url_rule("/users", "users", defaults={"page": 1})
+        self.app.add_url_rule("/users/page/<int:page>", "users")
+        urls = list(
+            iter_page_urls(self.app, "users", total=95, args={"q": "a b"})
+        )
+        assert len(urls) == 10
+        assert urls[0] == (1, "/users?q=a+b")
+        assert urls[-1] == (10, "/users/page/10?q=a+b")
+        assert list(
+            iter_page_urls(self.app, "test_route", total=95, first=9)
+        ) == [(9, "/?page=9"), (10, "/?page=10")]
+        assert list(iter_page_urls(self.app, "users", total=0)) == [
+            (1, "/users")
+        ]
+        assert len(list(iter_page_links(self.app, "users", total=0))) == 1
+
+        offline = dict(
+            iter_page_links(
+                self.app, "users", total=95, args={"q": "a b"}, last=3
+            )
+        )
+        assert sorted(offline) == [1, 2, 3]
+        with self.app.test_request_context("/users/page/2?q=a+b"):
+            assert offline[2] == Pagination(total=95, page=2).links
+
+    def test_resource_hints(self):
+        """The next and previous pages are hinted with their urls."""
+        with self.app.test_request_context("/?page=2&q=a"):
+            pagination = Pagination(total=30, page=2)
+            assert pagination.get_hint_urls() == ["/?page=3&q=a", "/?q=a"]
+            assert pagination.resource_hints() == (
+                '<link rel="prefetch" href="/?page=3&q=a">'
+                '<link rel="prefetch" href="/?q=a">'
+            )
+            assert 'rel="prerender"' in pagination.resource_hints("prerender")
+            rules = pagination.speculation_rules(eagerness="eager")
+            assert rules.startswith('<script type="speculationrules">')
+            assert json.loads(rules[32:-9]) == {
+                "prefetch": [
+                    {
+                        "eagerness": "eager",
+                        "source": "list",
+                        "urls": ["/?page=3&q=a", "/?q=a"],
+                    }
+                ]
+            }
+            response = set_pagination_headers(
+                self.app.response_class(), pagination, hints=True
+            )
+            assert response.headers["Link"].endswith(
+                "</?page=3&q=a>; rel=prefetch, </?q=a>; rel=prefetch"
+            )
+
+            pagination = Pagination(total=30, page=2, resource_hint="prerender")
+            assert pagination.get_hint_header() == (
+                "</?page=3&q=a>; rel=prerender, </?q=a>; rel=prerender"
+            )
+
+        with self.app.test_request_context("/"):
+            pagination = Pagination(total=5)
+            assert pagination.resource_hints() == ""
+            assert pagination.speculation_rules() == ""
+
+    def test_max_page(self):
+        """Pages past max_page or max_offset are clamped, 404 or redirected."""
+        from werkzeug.exceptions import HTTPException, NotFound
+
+        with self.app.test_request_context("/?page=500&per_page=10"):
+            assert get_page_args(max_page=20) == (20, 10, 190)
+            assert get_page_args(max_offset=1000) == (101, 10, 1000)
+            with pytest.raises(NotFound):
+                get_page_args(max_page=20, max_page_action="404")
+
+            with pytest.raises(HTTPException) as exc:
+                get_page_args(max_page=20, max_page_action="redirect")
+
+            response = exc.value.get_response()
+            assert response.status_code == 302
+            assert response.headers["Location"] == "/?page=20&per_page=10"
+
+            pagination = Pagination(total=10000, page=500, max_page=20)
+            assert pagination.page == 20
+            assert pagination.total_pages == 20
+            assert pagination.has_next is False
+            assert "/?page=21" not in pagination.links
+            with pytest.raises(HTTPException) as exc:
+                Pagination(
+                    total=10000, page=500, max_page=20, max_page_action="redirect"
+                )
+
+            assert exc.value.get_response().headers["Location"] == (
+                "/?page=20&per_page=10"
+            )
+
+        self.app.config["PAGINATION_MAX_OFFSET"] = 100
+        with self.app.test_request_context("/?page=500"):
+            assert get_page_args() == (11, 10, 100)
+            assert Pagination(total=10000, page=5).last_page == (
+                '<li class="page-item"><a class="page-link" href="/?page=11">'
+                "11</a></li>"
+            )
+
+    def test_per_page_limits(self):
+        """per_page is limited by max_per_page and per_page_choices."""
+        self.app.config["PAGINATION_MAX_PER_PAGE"] = 100
+        with self.app.test_request_context("/?page=-3&per_page=5000000"):
+            assert get_page_args() == (1, 100, 0)
+            assert get_page_args(per_page_choices=(10, 50)) == (1, 10, 0)
+            assert Pagination(total=10**7, per_page=5000000).per_page == 100
+
+        with self.app.test_request_context("/?per_page=-1"):
+            assert get_page_args() == (1, 10, 0)
+            assert get_page_args(show_all=True) == (1, 0, 0)
+            assert Pagination(total=100, per_page=0).is_disabled
+
+    def test_check_page_args(self):
+        """Malformed page args are rejected or redirected before the view."""
+        paginate = Paginate(self.app)
+        Paginate(self.app)
+        assert self.app.before_request_funcs[None] == [check_page_args]
+        assert self.app_client.get("/?page=abc").status_code == 200
+
+        # the hook follows the settings after the first request
+        self.app.config["PAGINATION_MAX_PER_PAGE"] = 100
+        self.app.config["PAGINATION_CHECK_ARGS"] = "redirect"
+        with self.app.app_context():
+            paginate.refresh()
+
+        response = self.app_client.get("/?page=abc&per_page=500&q=a")
+        assert response.status_code == 302
+        assert response.headers["Location"] == "/?page=1&per_page=100&q=a"
+        assert self.app_client.get("/?page=2&per_page=20").status_code == 200
+        assert self.app_client.post("/?page=0").status_code == 405
+
+        self.app.config["PAGINATION_CHECK_ARGS"] = "400"
+        paginate.refresh(self.app)
+        assert self.app_client.get("/?page=0").status_code == 400
+        assert self.app_client.get("/").status_code == 200
+
+        self.app.config["PAGINATION_CHECK_ARGS"] = None
+        paginate.refresh(self.app)
+        assert self.app_client.get("/?page=abc").status_code == 200
+        assert self.app.before_request_funcs[None] == [check_page_args]
+
+    def test_check_page_args_endpoints(self):
+        """The hook can be limited to some endpoints with their defaults."""
+        self.app.add_url_rule("/wiki", "wiki", lambda: "")
+        self.app.config["PAGINATION_CHECK_ARGS"] = "redirect"
+        self.app.config["PAGINATION_CHECK_EXCLUDE"] = ["wiki"]
+        paginate = Paginate(self.app)
+        assert self.app_client.get("/wiki?page=Home").status_code == 200
+        assert self.app_client.get("/?page=Home").status_code == 302
+
+        self.app.config["PAGINATION_CHECK_EXCLUDE"] = ()
+        self.app.config["PAGINATION_CHECK_ENDPOINTS"] = {
+            "test_route": {"per_page": 20}
+        }
+        paginate.refresh(self.app)
+        assert self.app_client.get("/wiki?page=Home").status_code == 200
+        assert self.app_client.get("/?per_page=20").status_code == 200
+        response = self.app_client.get("/?per_page=0")
+        assert response.headers["Location"] == "/?per_page=20"
+
+    def test_normalize_page_args(self):
+        """A page past the end is handled before the page query."""
+        from werkzeug.exceptions import HTTPException, NotFound
+
+        with self.app.test_request_context("/?page=9&q=a"):
+            assert normalize_page_args(95) == (9, 10, 80, 95)
+            counts = [0, 35]
+
+            def count():
+                return counts.pop()
+
+            assert normalize_page_args(count, total_key="a") == (4, 10, 30, 35)
+            assert normalize_page_args(count, total_key="a") == (4, 10, 30, 35)
+            assert normalize_page_args(0) == (1, 10, 0, 0)
+            with pytest.raises(NotFound):
+                normalize_page_args(35, out_of_range_action="404")
+
+            with pytest.raises(HTTPException) as exc:
+                normalize_page_args(35, out_of_range_action="redirect")
+
+            assert exc.value.get_response().headers["Location"] == "/?page=4&q=a"
+            with pytest.raises(HTTPException) as exc:
+                normalize_page_args(5, out_of_range_action="redirect")
+
+            assert exc.value.get_response().headers["Location"] == "/?q=a"
+
+    def test_paginate_iterable(self):
+        """Only the items up to the current page are read."""
+        read = []
+
+        def numbers():
+            for i in range(1000):
+                read.append(i)
+                yield i
+
+        with self.app.test_request_context("/?page=3"):
+            items, pagination = paginate_iterable(numbers())
+            assert items == list(range(20, 30))
+            assert len(read) == 31
+            assert pagination.has_more is True
+            assert pagination.total_pages == 4
+
+            items, pagination = paginate_iterable(range(95))
+            assert items == list(range(20, 30))
+            assert pagination.total == 95
+
+            items, pagination = paginate_iterable(iter(range(25)))
+            assert items == list(range(20, 25))
+            assert pagination.total == 25
+            assert pagination.has_next is False
+
+            items, pagination = paginate_iterable(
+                (i for i in range(1000)), length=1000, per_page=20
+            )
+            assert items == list(range(40, 60))
+            assert pagination.total_pages == 50
+
+
+class TestCursorPagination(FlaskTestMixin):
+    """Tests for the CursorPagination class."""
+
+    def setUp(self):
+        super(TestCursorPagination, self).setUp()
+        self.app.secret_key = "secret"
+
+    def test_cursor_roundtrip(self):
+        with self.app.test_request_context("/"):
+            cursor = encode_cursor(["bob", 12])
+            assert decode_cursor(cursor) == ["bob", 12]
+            assert decode_cursor(cursor + "x") is None
+            assert decode_cursor(None) is None
+
+    def test_per_page_limits(self):
+        self.app.config["PAGINATION_MAX_PER_PAGE"] = 100
+        self.app.config["PAGINATION_SHOW_ALL"] = True
+        with self.app.test_request_context("/?per_page=5000000"):
+            assert get_cursor_args() == (None, None, 100)
+
+        with self.app.test_request_context("/?per_page=-5"):
+            assert get_cursor_args() == (None, None, 10)
+            assert get_cursor_args(per_page=20) == (None, None, 20)
+
+    def test_first_page(self):
+        with self.app.test_request_context("/?q=a"):
+            assert get_cursor_args() == (None, None, 10)
+            pagination = CursorPagination(
+                first_key=1, last_key=10, has_next=True
+            )
+            assert not pagination.has_prev
+            assert pagination.prev_cursor is None
+            links = pagination.links
+            assert 'href="/?q=a&amp;after=' not in links
+            assert "/?q=a&after={0}".format(pagination.next_cursor) in links
+
+    def test_next_page(self):
+        with self.app.test_request_context("/"):
+            cursor = encode_cursor(10)
+
+        with self.app.test_request_context("/?after={0}".format(cursor)):
+            after, before, per_page = get_cursor_args()
+            assert (after, before, per_page) == (10, None, 10)
+            pagination = CursorPagination(first_key=11, last_key=20)
+            assert pagination.has_prev
+            assert not pagination.has_next
+            assert decode_cursor(pagination.prev_cursor) == 11
+            assert "/?before={0}".format(pagination.prev_cursor) in (
+                pagination.links
+            )
+            data = pagination.to_dict()
+            assert data["next_url"] is None
+            assert data["prev_url"] == "/?before={0}".format(data["prev_cursor"])
+
+    def test_bad_cursor(self):
+        """A tampered cursor is the first page, without a prev link."""
+        with self.app.test_request_context("/?after=tampered"):
+            assert get_cursor_args() == (None, None, 10)
+            pagination = CursorPagination(first_key=1, last_key=10)
+            assert not pagination.has_prev
+            assert pagination.prev_cursor is None
+
+    def test_missing_secret_key(self):
+        self.app.secret_key = None
+        with self.app.test_request_context("/?after=abc"):
+            with pytest.raises(RuntimeError):
+                get_cursor_args()
+
+
+class TestCountCache(unittest.TestCase):
+    """Tests for the count cache."""
+
+    def test_lru_eviction(self):
+        cache = LRUCountCache(max_entries=2)
+        for key in "abc":
+            cached_total(key, lambda: 1, cache=cache)
+
+        assert cache.get("a") is None
+        assert cache.get("c")[0] == 1
+
+    def test_expired_count_is_recomputed_once(self):
+        cache = LRUCountCache()
+        cache.set("k", 1, time.time() - 1)
+        cache.acquire("k")
+        # another caller is recomputing, the stale count is served
+        assert cached_total("k", lambda: 2, cache=cache) == 1
+        cache.release("k")
+        assert cached_total("k", lambda: 2, cache=cache) == 2
+        assert cached_total("k", lambda: 3, cache=cache) == 2
+
+    def test_missing_count_waits_for_the_computing_caller(self):
+        cache = LRUCountCache()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return 5
+
+        threads = [
+            threading.Thread(target=cached_total, args=("k", slow, 60, cache))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+
+    def test_shared_memory_cache(self):
+        path = tempfile.mkdtemp()
+        try:
+            cache = SharedMemoryCountCache(path)
+            assert cached_total(("k", 1), lambda: 7, cache=cache) == 7
+            other = SharedMemoryCountCache(path)
+            assert cached_total(("k", 1), lambda: 8, cache=other) == 7
+            assert cache.acquire("x")
+            assert not other.acquire("x", blocking=False)
+            cache.release("x")
+            assert other.acquire("x", blocking=False)
+            other.release("x")
+        finally:
+            shutil.rmtree(path)
+
+    def test_shared_memory_cache_is_bounded(self):
+        path = tempfile.mkdtemp()
+        try:
+            cache = SharedMemoryCountCache(
+                path, max_entries=3, lock_timeout=0.05, sweep_every=5
+            )
+            for i in range(5):
+                cache.set(("k", i), i, time.time() + 60)
+
+            assert len(os.listdir(path)) == 3
+            assert cache.acquire("x")
+            start = time.time()
+            other = SharedMemoryCountCache(path, lock_timeout=0.05)
+            assert not other.acquire("x")
+            assert time.time() - start >= 0.05
+            cache.release("x")
+        finally:
+            shutil.rmtree(path)
+
+    def test_boundary_index_is_bounded(self):
+        index = BoundaryIndex(max_queries=2, max_offsets=2)
+        for offset in (10, 30, 20):
+            index.add("a", offset, offset)
+
+        assert index.nearest("a", 25) == (20, 20)
+        assert index.nearest("a", 15) == (0, None)
+        index.add("b", 10, "x")
+        index.add("c", 10, "y")
+        assert index.nearest("a", 25) == (0, None)
+        assert index.nearest("c", 10) == (10, "y")
+
+
+class TestPaginateQuery(FlaskTestMixin):
+    """Tests for the SQLAlchemy integration."""
+
+    def setUp(self):
+        super(TestPaginateQuery, self).setUp()
+        sa = pytest.importorskip("sqlalchemy")
+        from sqlalchemy.orm import Session
+
+        self.engine = sa.create_engine("sqlite://")
+        metadata = sa.MetaData()
+        self.users = sa.Table(
+            "users",
+            metadata,
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("name", sa.String),
+        )
+        metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.execute(
+            self.users.insert(),
+            [{"name": "user{0:02d}".format(i)} for i in range(1, 26)],
+        )
+        self.stmt = sa.select(self.users.c.name).order_by(self.users.c.name)
+
+    def tearDown(self):
+        self.session.close()
+
+    def paginate(self, url, **kwargs):
+        from flask_paginate.sqla import paginate_query
+
+        with self.app.test_request_context(url):
+            return paginate_query(self.session, self.stmt, **kwargs)
+
+    def test_window(self):
+        rows, pagination = self.paginate("/?page=3")
+        assert rows == ["user21", "user22", "user23", "user24", "user25"]
+        assert pagination.total == 25
+        assert pagination.page == 3
+
+    def test_window_past_the_end(self):
+        rows, pagination = self.paginate("/?page=9")
+        assert rows == []
+        assert pagination.total == 25
+
+    def test_window_falls_back_to_count(self):
+        import sqlalchemy as sa
+        from sqlalchemy.dialects import mysql, sqlite
+        from flask_paginate.sqla import supports_window
+
+        self.stmt = sa.select(sa.func.substr(self.users.c.name, 1, 5)).distinct()
+        rows, pagination = self.paginate("/")
+        assert rows == ["user0", "user1", "user2"]
+        assert pagination.total == 3
+
+        dialect = mysql.dialect()
+        dialect.server_version_info = (5, 7, 30)
+        assert not supports_window(dialect)
+        dialect.server_version_info = (8, 0, 36)
+        assert supports_window(dialect)
+        dialect = sqlite.dialect()
+        dialect.dbapi = type(str("dbapi"), (), {"sqlite_version_info": (3, 22, 0)})
+        assert not supports_window(dialect)
+
+    def test_count(self):
+        rows, pagination = self.paginate("/?per_page=5", strategy="count")
+        assert rows == ["user01", "user02", "user03", "user04", "user05"]
+        assert pagination.total == 25
+        assert pagination.total_pages == 5
+
+    def test_probe(self):
+        rows, pagination = self.paginate("/?page=2", strategy="probe")
+        assert len(rows) == 10
+        assert pagination.has_next
+        rows, pagination = self.paginate("/?page=3", strategy="probe")
+        assert len(rows) == 5
+        assert not pagination.has_next
+
+    def test_pagination_class(self):
+        for strategy in ("window", "count", "probe", "seek"):
+            rows, pagination = self.paginate(
+                "/?page=2",
+                strategy=strategy,
+                key=self.users.c.id,
+                pagination_class=LazyPagination,
+            )
+            assert isinstance(pagination, LazyPagination), strategy
+
+    def test_deferred_join(self):
+        rows, pagination = self.paginate(
+            "/?page=2&per_page=3", strategy="deferred_join", key=self.users.c.id
+        )
+        assert rows == ["user04", "user05", "user06"]
+        assert pagination.total == 25
+
+    def test_seek(self):
+        from flask_paginate.sqla import query_fingerprint
+
+        boundaries = BoundaryIndex()
+        fingerprint = query_fingerprint(self.stmt)
+        kwargs = dict(
+            strategy="seek", key=self.users.c.name, boundaries=boundaries
+        )
+        rows, pagination = self.paginate("/?per_page=5", **kwargs)
+        assert rows == ["user01", "user02", "user03", "user04", "user05"]
+        assert boundaries.nearest(fingerprint, 7, 25) == (5, "user05")
+        rows, pagination = self.paginate("/?page=4&per_page=5", **kwargs)
+        assert rows == ["user16", "user17", "user18", "user19", "user20"]
+        assert pagination.total_pages == 5
+        assert boundaries.nearest(fingerprint, 20, 25) == (20, "user20")
+
+        # the keys are dropped when rows are inserted before them
+        self.session.execute(self.users.insert(), [{"name": "user00"}])
+        rows, pagination = self.paginate("/?page=2&per_page=5", **kwargs)
+        assert rows == ["user05", "user06", "user07", "user08", "user09"]
+        assert boundaries.nearest(fingerprint, 20, 26) == (10, "user09")
+
+        self.stmt = self.stmt.order_by(None).order_by(self.users.c.name.desc())
+        rows, pagination = self.paginate("/", descending=True, **kwargs)
+        rows, pagination = self.paginate("/?page=2", descending=True, **kwargs)
+        assert rows[0] == "user15"
+        assert len(rows) == 10
+
+
+class TestPaginateAsync(FlaskTestMixin):
+    """Tests for the async pagination."""
+
+    def setUp(self):
+        super(TestPaginateAsync, self).setUp()
+        self.periods = {}
+
+    async def count(self):
+        start = time.monotonic()
+        await asyncio.sleep(0.05)
+        self.periods["count"] = (start, time.monotonic())
+        return 95
+
+    async def fetch(self, offset, per_page):
+        start = time.monotonic()
+        await asyncio.sleep(0.05)
+        self.periods["fetch"] = (start, time.monotonic())
+        return list(range(offset, min(offset + per_page, 95)))
+
+    def test_flask(self):
+        from flask_paginate.aio import paginate_async
+
+        with self.app.test_request_context("/?page=10"):
+            items, pagination = asyncio.run(
+                paginate_async(self.count, self.fetch)
+            )
+            # the count and the fetch overlapped
+            count, fetch = self.periods["count"], self.periods["fetch"]
+            assert count[0] < fetch[1] and fetch[0] < count[1]
+            assert items == [90, 91, 92, 93, 94]
+            assert pagination.total_pages == 10
+            assert "/?page=9" in pagination.links
+
+    def test_quart(self):
+        quart = pytest.importorskip("quart")
+        from flask_paginate.aio import paginate_async
+
+        app = quart.Quart(__name__)
+
+        @app.route("/items")
+        async def items():
+            return ""
+
+        async def run():
+            async with app.test_request_context("/items?page=2&q=a"):
+                items, pagination = await paginate_async(
+                    self.count(), self.fetch, css_framework="bulma"
+                )
+                assert items == list(range(10, 20))
+                assert pagination.css_framework == "bulma"
+                assert "/items?page=3&q=a" in pagination.links
+                other = Pagination(total=100, page=2, css_framework="bulma")
+                assert other.links == pagination.links
+
+        asyncio.run(run())
+
+
+class TestFetchPage(FlaskTestMixin):
+    """Tests for fetching the count and the page in a thread pool."""
+
+    def setUp(self):
+        super(TestFetchPage, self).setUp()
+        self.barrier = None
+
+    def wait(self):
+        # both functions must be running at the same time to pass it
+        if self.barrier is not None:
+            self.barrier.wait()
+
+    def count(self):
+        self.wait()
+        return 95
+
+    def fetch(self, offset, per_page):
+        self.wait()
+        return list(range(offset, min(offset + per_page, 95)))
+
+    def test_sequential(self):
+        from flask_paginate.pool import fetch_page, get_executor
+
+        with self.app.test_request_context("/?page=10"):
+            assert get_executor() is None
+            items, pagination = fetch_page(self.count, self.fetch)
+            assert items == [90, 91, 92, 93, 94]
+            assert pagination.total_pages == 10
+
+    def test_concurrent(self):
+        from concurrent.futures import TimeoutError
+        from flask_paginate.pool import fetch_page, get_executor
+
+        self.app.config["PAGINATION_FETCH_WORKERS"] = 4
+
+        def fail(offset, per_page):
+            raise ValueError("no connection")
+
+        with self.app.test_request_context("/?page=2"):
+            executor = get_executor()
+            assert executor is get_executor()
+            self.barrier = threading.Barrier(2, timeout=5)
+            items, pagination = fetch_page(self.count, self.fetch)
+            assert items == list(range(10, 20))
+            assert pagination.total == 95
+            self.barrier = None
+            with pytest.raises(ValueError):
+                fetch_page(self.count, fail)
+
+            released = threading.Event()
+
+            def hung_count():
+                released.wait(5)
+                return 95
+
+            try:
+                with pytest.raises(TimeoutError):
+                    fetch_page(hung_count, self.fetch, timeout=0.01)
+            finally:
+                released.set()
+
+        executor.shutdown()
+
+
+class TestPaginationMetrics(FlaskTestMixin):
+    """Tests for the pagination metrics."""
+
+    def test_metrics(self):
+        from flask_paginate.metrics import PaginationMetrics
+
+        metrics = PaginationMetrics(self.app, url="/metrics", max_endpoints=1)
+        with self.app.test_request_context("/?page=30&per_page=20"):
+            self.app.preprocess_request()
+            page, per_page, offset = get_page_args()
+            Pagination(page=page, per_page=per_page, total=1000)
+
+        with self.app.test_request_context("/metrics?page=2"):
+            self.app.preprocess_request()
+            get_page_args()
+
+        text = self.app_client.get("/metrics").get_data(as_text=True)
+        assert 'flask_paginate_page_bucket{endpoint="test_route",le="20"} 0' in text
+        assert 'flask_paginate_page_bucket{endpoint="test_route",le="50"} 1' in text
+        assert 'flask_paginate_offset_sum{endpoint="test_route"} 580' in text
+        assert 'flask_paginate_total_pages_count{endpoint="test_route"} 1' in text
+        assert 'flask_paginate_page_count{endpoint="_other"} 1' in text
+
+        response = self.app_client.get(
+            "/metrics", environ_base={"REMOTE_ADDR": "10.0.0.1"}
+        )
+        assert response.status_code == 403
+        response = self.app_client.get(
+            "/metrics", headers={"X-Forwarded-For": "203.0.113.9"}
+        )
+        assert response.status_code == 403
+
+    def test_metrics_access(self):
+        from flask import request
+        from flask_paginate.metrics import PaginationMetrics
+
+        PaginationMetrics(
+            self.app,
+            url="/metrics",
+            access=lambda: request.headers.get("X-Token") == "secret",
+        )
+        assert self.app_client.get("/metrics").status_code == 403
+        response = self.app_client.get(
+            "/metrics",
+            headers={"X-Token": "secret", "X-Forwarded-For": "203.0.113.9"},
+        )
+        assert response.status_code == 200